@@ -0,0 +1,68 @@
+"""比较快速参数表与`parse_schema_as_cmd`+`argparse`解析叶子节点命令行的耗时.
+
+python benchmarks/bench_cmdline.py
+"""
+import argparse
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from schema_entry.utils import parse_schema_as_cmd
+from schema_entry.fastparse import build_argv_table
+
+TYPES = ("string", "number", "integer", "boolean", "array")
+
+
+def make_case(width: int) -> Tuple[Dict[str, Any], List[str]]:
+    properties: Dict[str, Any] = {}
+    argv: List[str] = []
+    for i in range(width):
+        _type = TYPES[i % len(TYPES)]
+        key = f"field_{i}"
+        if _type == "array":
+            properties[key] = {"type": "array", "items": {"type": "integer"}}
+        else:
+            properties[key] = {"type": _type}
+        if i % 10 == 0:
+            flag = f"--{key.replace('_', '-')}"
+            if _type == "boolean":
+                argv.append(flag)
+            elif _type == "string":
+                argv.extend([flag, "v"])
+            else:
+                argv.extend([flag, "1"])
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": properties,
+    }
+    return schema, argv
+
+
+def build_parser(schema: Dict[str, Any]) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bench")
+    parser.add_argument("-c", "--config", type=str)
+    for key, prop in schema["properties"].items():
+        parse_schema_as_cmd(key, prop, parser)
+    return parser
+
+
+def main() -> None:
+    for width in (10, 100, 500):
+        schema, argv = make_case(width)
+        parser = build_parser(schema)
+        table = build_argv_table(schema)  # type: ignore[arg-type]
+        assert table is not None
+        assert table.parse(argv) == vars(parser.parse_args(argv))
+        number = 200
+        rows = {
+            "build parser + argparse": timeit.timeit(lambda: build_parser(schema).parse_args(argv), number=number),
+            "cached parser + argparse": timeit.timeit(lambda: parser.parse_args(argv), number=number),
+            "fast argv table": timeit.timeit(lambda: table.parse(argv), number=number),
+        }
+        print(f"width={width} argc={len(argv)}")
+        for name, cost in rows.items():
+            print(f"    {name:<28}{cost / number * 1000:10.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""比较同一份配置以不同格式保存时的读取耗时.
+
+python benchmarks/bench_codecs.py
+"""
+import json
+import marshal
+import tempfile
+import timeit
+from pathlib import Path
+
+import yaml
+
+from schema_entry.config_codecs import get_config_codec
+from bench_extract import make_document
+
+
+def main() -> None:
+    document = make_document(200)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = {
+            "config.json": json.dumps(document).encode("utf-8"),
+            "config.yml": yaml.dump(document, Dumper=yaml.CDumper).encode("utf-8"),
+            "config.marshal": marshal.dumps(document),
+        }
+        for name, data in files.items():
+            p = Path(tmpdir) / name
+            p.write_bytes(data)
+            codec = get_config_codec(p.suffix)
+            assert codec is not None
+            number = 3 if p.suffix == ".yml" else 20
+            cost = timeit.timeit(lambda: codec(p), number=number) / number
+            print(f"{name:<16}{len(data) / 1024:10.1f} KB{cost * 1000:10.2f} ms/load")
+
+
+if __name__ == "__main__":
+    main()
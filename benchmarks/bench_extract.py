@@ -0,0 +1,42 @@
+"""比较只提取需要的顶层字段与完整解析yaml配置文件的耗时.
+
+json配置文件不使用逐字段提取,这里也列出json完整解析的耗时作为参照.
+
+python benchmarks/bench_extract.py
+"""
+import json
+import timeit
+from typing import Any, Dict
+
+import yaml
+
+from schema_entry.extract import extract_yaml_keys
+
+KEYS = frozenset(["service_0", "service_1"])
+
+
+def make_document(services: int) -> Dict[str, Any]:
+    return {
+        f"service_{i}": {
+            "hosts": [f"10.0.{i % 256}.{j}" for j in range(20)],
+            "options": {f"option_{j}": {"enabled": j % 2 == 0, "weight": j / 3} for j in range(20)},
+        }
+        for i in range(services)
+    }
+
+
+def main() -> None:
+    for services in (50, 200):
+        document = make_document(services)
+        json_text = json.dumps(document, indent=2)
+        yaml_text = yaml.dump(document, Dumper=yaml.CDumper)
+        number = 20
+        json_full = timeit.timeit(lambda: json.loads(json_text), number=number) / number
+        yaml_full = timeit.timeit(lambda: yaml.load(yaml_text, Loader=yaml.CLoader), number=3) / 3
+        yaml_part = timeit.timeit(lambda: extract_yaml_keys(yaml_text, KEYS), number=3) / 3
+        print(f"services={services} json: full {json_full * 1000:.2f}ms "
+              f"yaml: full {yaml_full * 1000:.2f}ms selective {yaml_part * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""比较编译校验函数与`jsonschema.validate`在宽schema上的耗时.
+
+python benchmarks/bench_validator.py
+"""
+import timeit
+from typing import Any, Dict, Tuple
+from jsonschema import validate
+
+from schema_entry.validator import get_validator
+from schema_entry.compiler import compile_validator
+
+TYPES = ("string", "number", "integer", "boolean", "array")
+
+
+def make_case(width: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    properties: Dict[str, Any] = {}
+    instance: Dict[str, Any] = {}
+    for i in range(width):
+        _type = TYPES[i % len(TYPES)]
+        key = f"field_{i}"
+        if _type == "string":
+            properties[key] = {"type": "string", "maxLength": 32, "pattern": "^v"}
+            instance[key] = f"v{i}"
+        elif _type == "number":
+            properties[key] = {"type": "number", "minimum": 0}
+            instance[key] = i / 2
+        elif _type == "integer":
+            properties[key] = {"type": "integer", "enum": [i, i + 1]}
+            instance[key] = i
+        elif _type == "boolean":
+            properties[key] = {"type": "boolean"}
+            instance[key] = True
+        else:
+            properties[key] = {"type": "array", "items": {"type": "integer"}}
+            instance[key] = [1, 2, 3]
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": properties,
+        "required": list(properties)[::2],
+    }
+    return schema, instance
+
+
+def main() -> None:
+    for width in (500, 1000, 2000):
+        schema, instance = make_case(width)
+        compiled = compile_validator(schema)
+        assert compiled is not None
+        jsonschema_validator = get_validator(schema).validator
+        number = 20
+        rows = {
+            "jsonschema.validate": timeit.timeit(lambda: validate(instance, schema), number=number),
+            "cached jsonschema validator": timeit.timeit(lambda: jsonschema_validator.validate(instance), number=number),
+            "compiled validator": timeit.timeit(lambda: compiled(instance), number=number),
+        }
+        print(f"width={width}")
+        for name, cost in rows.items():
+            print(f"    {name:<28}{cost / number * 1000:10.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""binary.
+
+以内存映射读取的大数值数组字段.
+
+元素类型为`integer`或`number`的`array`字段可能有上百万个元素(分片id,权重等),
+从json中读出的是由python整数和浮点数对象组成的列表,每个进程都要占用数百MB内存.
+这样的字段在配置文件中可以写成指向原始二进制文件的引用:
+
+```json
+{"weights": {"$binary": "weights.f64"}}
+```
+
+引用的文件以`mmap`只读映射,字段的值是按元素类型转换过的`memoryview`,多个进程共享操作系统的页缓存.
+
++ 元素类型默认由文件后缀决定,也可以用`"dtype"`指定,支持`i8`,`u8`,`i16`,`u16`,`i32`,`u32`,`i64`,`u64`,`f32`,`f64`,字节序为本机字节序
++ 相对路径相对于引用它的配置文件所在的目录
++ schema校验时只检查元素类型与`items.type`是否相容,不逐个检查元素
+"""
+import os
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional, TypeGuard
+
+BINARY_KEY = "$binary"
+
+DTYPES = {
+    "i8": "b",
+    "u8": "B",
+    "i16": "h",
+    "u16": "H",
+    "i32": "i",
+    "u32": "I",
+    "i64": "q",
+    "u64": "Q",
+    "f32": "f",
+    "f64": "d",
+}
+INTEGER_FORMATS = frozenset("bBhHiIqQ")
+FORMATS = frozenset(DTYPES.values())
+
+
+def is_binary_ref(value: Any) -> TypeGuard[Dict[str, Any]]:
+    """判断值是否为二进制文件引用`{"$binary": "path"}`."""
+    return isinstance(value, dict) and isinstance(value.get(BINARY_KEY), str)
+
+
+def load_binary_array(p: Path, dtype: str) -> memoryview:
+    """以内存映射读取原始二进制数组.
+
+    Args:
+        p (Path): 二进制文件路径.
+        dtype (str): 元素类型,例如`f64`.
+
+    Raises:
+        ValueError: 不支持的元素类型或文件大小不是元素大小的整数倍
+        OSError: 文件无法读取
+
+    Returns:
+        memoryview: 按元素类型转换过的只读视图
+
+    """
+    fmt = DTYPES.get(dtype)
+    if fmt is None:
+        raise ValueError(f"不支持的元素类型{dtype}")
+    itemsize = struct.calcsize(fmt)
+    with open(p, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % itemsize != 0:
+            raise ValueError(f"{str(p)}的大小{size}不是{dtype}元素大小{itemsize}的整数倍")
+        if size == 0:
+            return memoryview(b"").cast(fmt)  # type: ignore[call-overload]
+        # 映射在视图被释放前一直有效,文件可以先关闭
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mm).cast(fmt)  # type: ignore[call-overload]
+
+
+def resolve_binary_ref(ref: Dict[str, Any], base_dir: Path) -> memoryview:
+    """读取二进制文件引用指向的数组.
+
+    Args:
+        ref (Dict[str, Any]): 二进制文件引用.
+        base_dir (Path): 相对路径的基准目录.
+
+    Raises:
+        ValueError: 无法确定或不支持的元素类型,文件大小不是元素大小的整数倍
+        OSError: 文件无法读取
+
+    Returns:
+        memoryview: 按元素类型转换过的只读视图
+
+    """
+    p = base_dir / ref[BINARY_KEY]
+    dtype = ref.get("dtype") or p.suffix[1:]
+    return load_binary_array(p, dtype)
+
+
+def check_binary_array(key: str, value: memoryview, prop: Dict[str, Any]) -> Optional[str]:
+    """检查二进制数组是否满足字段的schema.
+
+    Args:
+        key (str): 字段名.
+        value (memoryview): 二进制数组.
+        prop (Dict[str, Any]): 字段的schema.
+
+    Returns:
+        Optional[str]: 不满足时的错误信息,满足时为None
+
+    """
+    item_type = (prop.get("items") or {}).get("type")
+    if value.format not in FORMATS or item_type not in ("integer", "number"):
+        return f"{key}: 二进制数组的元素类型{value.format}与schema不相容"
+    if item_type == "integer" and value.format not in INTEGER_FORMATS:
+        return f"{key}: 二进制数组的元素类型{value.format}不是整数类型"
+    return None
+
+
+def without_binary_properties(schema: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    """获取将指定字段的schema替换为不做约束的`{}`后的schema副本,用于校验其余的字段."""
+    skip: FrozenSet[str] = frozenset(keys)
+    result = dict(schema)
+    result["properties"] = {key: {} if key in skip else prop for key, prop in schema.get("properties", {}).items()}
+    return result
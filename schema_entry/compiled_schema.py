@@ -0,0 +1,71 @@
+"""compiled_schema.
+
+节点schema的一次性索引.
+
+解析命令行,筛选配置文件和获取默认值时都需要反复查询schema中的字段顺序,必填字段,布尔型字段等信息,
+`CompiledSchema`在schema第一次被使用时把这些信息整理为集合和字典,之后的查询都是常数时间.
+编译结果按保留key顺序的schema指纹缓存,相同schema的节点共享同一个`CompiledSchema`,字段顺序与schema中一致.
+"""
+import json
+import functools
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from .frozen import FrozenDict, freeze
+from .converters import PropertyConverter, compile_converters
+from .utils import schema_fingerprint
+
+
+class CompiledSchema:
+    """编译后的节点schema.
+
+    Attributes:
+        properties (Dict[str, Any]): 字段名到字段schema的映射
+        keys (Tuple[str, ...]): 按schema中顺序排列的字段名
+        required (FrozenSet[str]): 必填字段
+        boolean_keys (FrozenSet[str]): 布尔型字段
+        binary_keys (FrozenSet[str]): 元素为整数或数值的数组字段,可以从二进制文件中读取
+        option_strings (Dict[str, Tuple[str, ...]]): 字段名到命令行参数名(例如`-a`,`--a-a`)的映射
+        defaults (FrozenDict): schema中定义了默认值的字段的默认值
+        converters (Dict[str, PropertyConverter]): 字段名到值转换器的映射
+
+    """
+    __slots__ = ("properties", "keys", "required", "boolean_keys", "binary_keys", "option_strings", "defaults", "converters")
+
+    def __init__(self, schema: Any) -> None:
+        properties: Dict[str, Any] = schema.get("properties") or {}
+        self.properties = properties
+        self.keys: Tuple[str, ...] = tuple(properties)
+        self.required: FrozenSet[str] = frozenset(schema.get("required") or ())
+        self.boolean_keys: FrozenSet[str] = frozenset(key for key, prop in properties.items() if prop.get("type") == "boolean")
+        self.binary_keys: FrozenSet[str] = frozenset(
+            key for key, prop in properties.items()
+            if prop.get("type") == "array" and isinstance(prop.get("items"), dict) and prop["items"].get("type") in ("integer", "number"))
+        self.option_strings: Dict[str, Tuple[str, ...]] = {}
+        for key, prop in properties.items():
+            option_strings: List[str] = [f"--{key.replace('_', '-')}"]
+            if prop.get("title"):
+                option_strings.insert(0, f"-{prop['title'][0]}")
+            self.option_strings[key] = tuple(option_strings)
+        self.defaults: FrozenDict = freeze({key: prop.get("default") for key, prop in properties.items() if prop.get("default")})
+        self.converters: Dict[str, PropertyConverter] = compile_converters(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(fingerprint: str) -> CompiledSchema:
+    return CompiledSchema(json.loads(fingerprint))
+
+
+def compile_schema(schema: Any) -> CompiledSchema:
+    """编译节点的schema.
+
+    结果按保留key顺序的schema指纹缓存,调用方不应修改其中的内容.
+
+    Args:
+        schema (Any): 节点的json schema字典.
+
+    Returns:
+        CompiledSchema: 编译后的schema
+
+    """
+    # 字段顺序决定命令行参数,默认值和最终配置的顺序,指纹不能按key排序
+    return _compile(schema_fingerprint(schema, sort_keys=False))
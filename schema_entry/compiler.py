@@ -0,0 +1,245 @@
+"""compiler.
+
+将`SUPPORT_SCHEMA`支持的schema子集编译为专用的校验函数.
+
+叶子节点的schema只有一层`properties`,字段类型只有boolean,string,number,integer和array,
+约束也只有enum,const,最大最小值,pattern,长度和`required`.
+这样的schema可以提前生成一段python源码,每个字段的检查都被展开成直接的`isinstance`和比较,
+省去了通用校验器逐个关键字分发的开销.
+
+无法编译的schema(出现了子集之外的关键字或类型)会返回`None`,由调用方退回到`jsonschema`校验.
+"""
+import re
+import json
+import functools
+from numbers import Number
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from jsonschema.exceptions import ValidationError
+
+from .utils import schema_fingerprint
+
+# 编译出的校验函数接收待校验的配置,不满足schema时抛出`jsonschema.exceptions.ValidationError`
+CompiledValidator = Callable[[Any], None]
+
+# 整型兼容浮点表示的整数(例如`1.0`)是draft6之后的行为,draft3/draft4的schema不做编译
+_SUPPORT_DRAFTS = (
+    "http://json-schema.org/draft-06/schema",
+    "http://json-schema.org/draft-07/schema",
+    "https://json-schema.org/draft/2019-09/schema",
+    "https://json-schema.org/draft/2020-12/schema",
+)
+_ANNOTATION_KEYWORDS = {"title", "description", "$comment", "default", "format", "examples"}
+_ROOT_KEYWORDS = {"$schema", "$id", "type", "properties", "required", "title", "description", "$comment"}
+_NUMBER_KEYWORDS = {"minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"}
+_STRING_KEYWORDS = {"minLength", "maxLength", "pattern"}
+_ITEM_TYPES = ("string", "number", "integer", "boolean")
+
+_TYPE_CHECKS = {
+    "boolean": "isinstance({v}, bool)",
+    "string": "isinstance({v}, str)",
+    "number": "(isinstance({v}, Number) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+    "array": "isinstance({v}, list)",
+}
+_COMPARE_CHECKS = {
+    "minimum": ("{v} < {c}", "is less than the minimum of"),
+    "maximum": ("{v} > {c}", "is greater than the maximum of"),
+    "exclusiveMinimum": ("{v} <= {c}", "is less than or equal to the minimum of"),
+    "exclusiveMaximum": ("{v} >= {c}", "is greater than or equal to the maximum of"),
+}
+
+
+class _Unsupported(Exception):
+    """schema超出了可编译的子集."""
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+def _check_value_type(_type: str, value: Any) -> bool:
+    if _type == "boolean":
+        return isinstance(value, bool)
+    if _type == "string":
+        return isinstance(value, str)
+    if _type == "number":
+        return _is_number(value)
+    if _type == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    return False
+
+
+class _SourceBuilder:
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = {
+            "ValidationError": ValidationError,
+            "Number": Number,
+        }
+
+    def const(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def emit_raise(self, indent: int, message: str) -> None:
+        self.emit(indent, f"raise ValidationError({message})")
+
+    def emit_scalar_checks(self, indent: int, var: str, schema: Dict[str, Any], allowed: set) -> None:
+        """生成标量值的类型,enum,const和取值范围检查."""
+        unknown = set(schema) - allowed
+        if unknown:
+            raise _Unsupported(f"unsupported keywords {sorted(unknown)}")
+        _type = schema.get("type")
+        if not isinstance(_type, str) or _type not in _TYPE_CHECKS or _type == "array":
+            raise _Unsupported(f"unsupported type {_type!r}")
+        self.emit(indent, f"if not {_TYPE_CHECKS[_type].format(v=var)}:")
+        self.emit_raise(indent + 1, f"f\"{{{var}!r}} is not of type {_type!r}\"")
+        if "enum" in schema:
+            enum = schema["enum"]
+            if not isinstance(enum, list) or not enum or not all(_check_value_type(_type, i) for i in enum):
+                raise _Unsupported("enum values must match the field type")
+            choices = self.const(frozenset(enum))
+            display = self.const(enum)
+            self.emit(indent, f"if {var} not in {choices}:")
+            self.emit_raise(indent + 1, f"f\"{{{var}!r}} is not one of {{{display}!r}}\"")
+        if "const" in schema:
+            if not _check_value_type(_type, schema["const"]):
+                raise _Unsupported("const value must match the field type")
+            const = self.const(schema["const"])
+            self.emit(indent, f"if {var} != {const}:")
+            self.emit_raise(indent + 1, f"f\"{{{const}!r}} was expected\"")
+        for keyword, (cond, message) in _COMPARE_CHECKS.items():
+            if keyword in schema:
+                if _type not in ("number", "integer") or not _is_number(schema[keyword]):
+                    raise _Unsupported(f"bad {keyword}")
+                const = self.const(schema[keyword])
+                self.emit(indent, f"if {cond.format(v=var, c=const)}:")
+                self.emit_raise(indent + 1, f"f\"{{{var}!r}} {message} {{{const}!r}}\"")
+        if _type == "string":
+            for keyword, op, message in (("minLength", "<", "is too short"), ("maxLength", ">", "is too long")):
+                if keyword in schema:
+                    limit = schema[keyword]
+                    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+                        raise _Unsupported(f"bad {keyword}")
+                    self.emit(indent, f"if len({var}) {op} {limit!r}:")
+                    self.emit_raise(indent + 1, f"f\"{{{var}!r}} {message}\"")
+            if "pattern" in schema:
+                try:
+                    pattern = re.compile(schema["pattern"])
+                except (TypeError, re.error):
+                    raise _Unsupported("bad pattern")
+                compiled = self.const(pattern)
+                display = self.const(schema["pattern"])
+                self.emit(indent, f"if {compiled}.search({var}) is None:")
+                self.emit_raise(indent + 1, f"f\"{{{var}!r}} does not match {{{display}!r}}\"")
+
+    def emit_property(self, key: str, prop: Any) -> None:
+        if not isinstance(prop, dict):
+            raise _Unsupported("property schema must be an object")
+        self.emit(1, f"if {key!r} in instance:")
+        self.emit(2, f"v = instance[{key!r}]")
+        if prop.get("type") != "array":
+            allowed = {"type", "enum", "const"} | _ANNOTATION_KEYWORDS
+            if prop.get("type") in ("number", "integer"):
+                allowed |= _NUMBER_KEYWORDS
+            elif prop.get("type") == "string":
+                allowed |= _STRING_KEYWORDS
+            self.emit_scalar_checks(2, "v", prop, allowed)
+            return
+        unknown = set(prop) - ({"type", "items"} | _ANNOTATION_KEYWORDS)
+        if unknown:
+            raise _Unsupported(f"unsupported array keywords {sorted(unknown)}")
+        self.emit(2, f"if not {_TYPE_CHECKS['array'].format(v='v')}:")
+        self.emit_raise(3, "f\"{v!r} is not of type 'array'\"")
+        items = prop.get("items")
+        if items is None:
+            return
+        if not isinstance(items, dict) or items.get("type") not in _ITEM_TYPES:
+            raise _Unsupported("array items must be a typed object")
+        self.emit(2, "for i in v:")
+        self.emit_scalar_checks(3, "i", items, {"type", "enum"} | _ANNOTATION_KEYWORDS)
+
+    def build(self, schema: Any) -> str:
+        if not isinstance(schema, dict):
+            raise _Unsupported("schema must be an object")
+        unknown = set(schema) - _ROOT_KEYWORDS
+        if unknown:
+            raise _Unsupported(f"unsupported root keywords {sorted(unknown)}")
+        draft = schema.get("$schema")
+        if draft is not None and draft.rstrip("#") not in _SUPPORT_DRAFTS:
+            raise _Unsupported(f"unsupported draft {draft!r}")
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+        if not isinstance(properties, dict) or not isinstance(required, list) or not all(isinstance(i, str) for i in required):
+            raise _Unsupported("bad properties or required")
+        self.emit(0, "def validate(instance):")
+        if "type" in schema:
+            if schema["type"] != "object":
+                raise _Unsupported("root type must be object")
+            self.emit(1, "if not isinstance(instance, dict):")
+            self.emit_raise(2, "f\"{instance!r} is not of type 'object'\"")
+        elif properties or required:
+            # 非object的实例不受properties和required约束
+            self.emit(1, "if not isinstance(instance, dict):")
+            self.emit(2, "return")
+        for key in dict.fromkeys(required):
+            message = f"{key!r} is a required property"
+            self.emit(1, f"if {key!r} not in instance:")
+            self.emit_raise(2, repr(message))
+        for key, prop in properties.items():
+            self.emit_property(key, prop)
+        self.emit(1, "return None")
+        return "\n".join(self.lines) + "\n"
+
+
+def _generate(schema: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    builder = _SourceBuilder()
+    try:
+        source = builder.build(schema)
+    except _Unsupported:
+        return None
+    return source, builder.namespace
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(fingerprint: str) -> Optional[Tuple[str, CompiledValidator]]:
+    generated = _generate(json.loads(fingerprint))
+    if generated is None:
+        return None
+    source, namespace = generated
+    exec(compile(source, f"<schema_entry compiled validator {hash(fingerprint) & 0xffffffff:08x}>", "exec"), namespace)
+    return source, namespace["validate"]
+
+
+def generate_validator_source(schema: Any) -> Optional[str]:
+    """生成schema对应校验函数的源码.
+
+    Args:
+        schema (Any): json schema字典.
+
+    Returns:
+        Optional[str]: 校验函数`validate(instance)`的源码,schema无法编译时返回None
+
+    """
+    compiled = _compile(schema_fingerprint(schema))
+    return None if compiled is None else compiled[0]
+
+
+def compile_validator(schema: Any) -> Optional[CompiledValidator]:
+    """将schema编译为校验函数.
+
+    编译结果按schema指纹缓存.需要注意编译过程不会检查schema本身是否合法,调用方应当先用`check_schema`确认.
+
+    Args:
+        schema (Any): json schema字典.
+
+    Returns:
+        Optional[CompiledValidator]: 校验函数,schema无法编译时返回None
+
+    """
+    compiled = _compile(schema_fingerprint(schema))
+    return None if compiled is None else compiled[1]
@@ -0,0 +1,134 @@
+"""compression.
+
+压缩的配置文件.
+
+大的生成式配置文件(主机表,路由表等)通常压缩后再分发.这个模块识别`config.json.gz`,`config.yml.xz`这样的复合后缀,
+最后一个后缀决定压缩格式,前一个后缀决定配置文件格式.文件以流的方式解压后直接交给配置文件格式的读取函数,不会写临时文件.
+
+支持的压缩格式有`.gz`,`.xz`和`.bz2`.每个文件读取的原始字节数和解压后的字节数会累计在进程内,
+可以通过`decompression_info()`查看.
+"""
+import os
+import bz2
+import gzip
+import lzma
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterator, NamedTuple, Optional, Tuple, cast
+
+from .config_codecs import ConfigCodec
+
+_openers: Dict[str, Callable[[BinaryIO], Any]] = {
+    ".gz": lambda f: gzip.GzipFile(fileobj=f, mode="rb"),
+    ".xz": lambda f: lzma.LZMAFile(f, mode="rb"),
+    ".bz2": lambda f: bz2.BZ2File(f, mode="rb"),
+}
+
+
+class DecompressionInfo(NamedTuple):
+    """压缩的配置文件的读取统计.
+
+    Attributes:
+        reads (int): 解压读取的次数
+        raw_bytes (int): 从磁盘读取的原始字节数
+        decompressed_bytes (int): 解压后的字节数
+
+    """
+    reads: int
+    raw_bytes: int
+    decompressed_bytes: int
+
+
+_stats: Dict[str, DecompressionInfo] = {}
+_lock = threading.Lock()
+
+
+def split_compression_suffix(p: Path) -> Tuple[str, Optional[str]]:
+    """拆分配置文件的格式后缀和压缩后缀.
+
+    Args:
+        p (Path): 配置文件路径.
+
+    Returns:
+        Tuple[str, Optional[str]]: 格式后缀和压缩后缀,没有压缩时压缩后缀为None
+
+    """
+    suffixes = p.suffixes
+    if len(suffixes) >= 2 and suffixes[-1] in _openers:
+        return suffixes[-2], suffixes[-1]
+    return p.suffix, None
+
+
+def _record(p: Path, raw_bytes: int, decompressed_bytes: int) -> None:
+    key = os.path.realpath(p)
+    with _lock:
+        info = _stats.get(key, DecompressionInfo(0, 0, 0))
+        _stats[key] = DecompressionInfo(info.reads + 1, info.raw_bytes + raw_bytes, info.decompressed_bytes + decompressed_bytes)
+
+
+@contextmanager
+def open_config_stream(p: Path, compression: Optional[str] = None) -> Iterator[BinaryIO]:
+    """以二进制流打开配置文件,有压缩后缀时得到解压后的流.
+
+    Args:
+        p (Path): 配置文件路径.
+        compression (Optional[str], optional): 压缩后缀,为None时不解压. Defaults to None.
+
+    Yields:
+        BinaryIO: 配置文件内容的二进制流
+
+    """
+    with open(p, "rb") as raw:
+        if compression is None:
+            yield raw
+            return
+        with _openers[compression](raw) as f:
+            yield cast(BinaryIO, f)
+            decompressed_bytes = f.tell()
+        _record(p, raw.tell(), decompressed_bytes)
+
+
+class CompressedCodec:
+    """读取压缩的配置文件的解析函数.
+
+    解析函数以配置文件格式和压缩格式判断相等,可以作为配置文件缓存的键.
+    解压的开销本身就值得持久化缓存,因此无论解压后的格式是否使用持久化缓存,`cache_name`都不为None.
+
+    Args:
+        codec (ConfigCodec): 解压后内容的配置文件格式.
+        compression (str): 压缩后缀.
+
+    """
+
+    def __init__(self, codec: ConfigCodec, compression: str) -> None:
+        if compression not in _openers:
+            raise ValueError(f"不支持的压缩格式{compression}")
+        self.codec = codec
+        self.compression = compression
+        self.cache_name = f"{type(self).__name__}.{codec.name}{compression}"
+
+    def __call__(self, p: Path) -> Any:
+        with open_config_stream(p, self.compression) as f:
+            return self.codec.load(f)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompressedCodec) and (self.codec, self.compression) == (other.codec, other.compression)
+
+    def __hash__(self) -> int:
+        return hash((CompressedCodec, self.codec, self.compression))
+
+    def __repr__(self) -> str:
+        return f"CompressedCodec({self.codec!r}, {self.compression!r})"
+
+
+def decompression_info() -> Dict[str, DecompressionInfo]:
+    """获取每个压缩的配置文件的读取统计,键为文件的真实路径."""
+    with _lock:
+        return dict(_stats)
+
+
+def clear_decompression_info() -> None:
+    """清空压缩的配置文件的读取统计."""
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,110 @@
+"""config_codecs.
+
+按后缀分发的配置文件格式注册表.
+
+每种配置文件格式对应一个`ConfigCodec`,它从二进制流中读取配置.内置的格式有:
+
++ `.json`: json
++ `.yml`,`.yaml`: yaml,使用`yaml.CLoader`
++ `.toml`: toml,python3.11起使用标准库`tomllib`,更早的版本需要安装`tomli`
++ `.marshal`: `marshal`序列化的配置快照,读取速度比yaml快一个数量级以上,但只能由相同版本的python读取
++ `.msgpack`: msgpack序列化的配置快照,需要安装`msgpack`
+
+可以使用`register_config_codec`注册新的格式或替换内置的格式.
+"""
+import json
+import marshal
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+import yaml
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib  # type: ignore
+    except ImportError:
+        tomllib = None  # type: ignore
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class ConfigCodec:
+    """一种配置文件格式.
+
+    以配置文件路径调用时会以二进制模式打开文件并读取其中的配置,
+    编解码器在注册表中是单例,可以作为配置文件缓存的键.
+    `cache_name`是持久化缓存使用的跨进程稳定的名字,为None时不使用持久化缓存.
+
+    Args:
+        name (str): 格式名.
+        load (Callable[[BinaryIO], Any]): 从二进制流中读取配置的函数.
+        disk_cacheable (bool): 是否值得使用持久化缓存,本身就很快的格式不需要. Defaults to True.
+
+    """
+
+    def __init__(self, name: str, load: Callable[[BinaryIO], Any], *, disk_cacheable: bool = True) -> None:
+        self.name = name
+        self.load = load
+        self.cache_name: Optional[str] = f"{type(self).__name__}.{name}" if disk_cacheable else None
+
+    def __call__(self, p: Path) -> Any:
+        with open(p, "rb") as f:
+            return self.load(f)
+
+    def __repr__(self) -> str:
+        return f"ConfigCodec({self.name!r})"
+
+
+def _load_yaml(f: BinaryIO) -> Any:
+    return yaml.load(f, Loader=yaml.CLoader)
+
+
+def _load_marshal(f: BinaryIO) -> Any:
+    # `marshal.load`直接读取文件对象时会对每个对象做一次小的读取,一次读入内存后再解码要快得多
+    return marshal.loads(f.read())
+
+
+JSON_CODEC = ConfigCodec("json", json.load, disk_cacheable=False)
+YAML_CODEC = ConfigCodec("yaml", _load_yaml)
+MARSHAL_CODEC = ConfigCodec("marshal", _load_marshal, disk_cacheable=False)
+
+_registry: Dict[str, ConfigCodec] = {
+    ".json": JSON_CODEC,
+    ".yml": YAML_CODEC,
+    ".yaml": YAML_CODEC,
+    ".marshal": MARSHAL_CODEC,
+}
+
+if tomllib is not None:
+    _registry[".toml"] = ConfigCodec("toml", tomllib.load)
+
+if msgpack is not None:  # pragma: no cover
+    def _load_msgpack(f: BinaryIO) -> Any:
+        return msgpack.unpack(f, raw=False)
+
+    _registry[".msgpack"] = ConfigCodec("msgpack", _load_msgpack, disk_cacheable=False)
+
+
+def register_config_codec(suffix: str, codec: ConfigCodec) -> None:
+    """注册配置文件格式.
+
+    Args:
+        suffix (str): 文件后缀,例如`.ini`.
+        codec (ConfigCodec): 对应的格式.
+
+    """
+    _registry[suffix] = codec
+
+
+def get_config_codec(suffix: str) -> Optional[ConfigCodec]:
+    """获取后缀对应的配置文件格式,没有注册时返回None."""
+    return _registry.get(suffix)
+
+
+def config_codec_suffixes() -> List[str]:
+    """获取已注册的全部文件后缀."""
+    return list(_registry)
@@ -0,0 +1,132 @@
+"""converters.
+
+预编译的字段值转换器.
+
+环境变量和命令行参数给出的都是字符串,需要按schema中字段的类型转换.
+`compile_converters`为schema中的每个字段预先生成一个转换器,字段类型,数组元素类型和可选值都只在编译时读取一次,
+编译结果按保留key顺序的schema指纹缓存,环境变量和快速命令行解析共用同一份转换器.
+"""
+import json
+import warnings
+import functools
+from typing import Any, Callable, Dict, List, Optional
+
+from .utils import schema_fingerprint
+
+Converter = Callable[[str], Any]
+
+
+def _to_bool(value_str: str) -> bool:
+    return value_str.upper() == "TRUE"
+
+
+_SCALAR_CONVERTERS: Dict[str, Converter] = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": _to_bool,
+}
+
+
+def _identity(value_str: str) -> str:
+    return value_str
+
+
+def _split(value_str: str) -> List[str]:
+    return value_str.split(",")
+
+
+def _unsupported(_type: Any) -> Converter:
+    def convert(value_str: str) -> str:
+        warnings.warn(f"不支持的数据类型{_type}")
+        return value_str
+    return convert
+
+
+def _with_choices(convert: Converter, choices: List[Any]) -> Converter:
+    def convert_in_choices(value_str: str) -> Any:
+        value = convert(value_str)
+        if value not in choices:
+            raise ValueError(f"{value!r} 不是可选值{choices!r}之一")
+        return value
+    return convert_in_choices
+
+
+def build_converter(schema: Any) -> Converter:
+    """根据字段的schema构造字符串值的转换函数.
+
+    转换规则与`utils.parse_value_string_by_schema`一致,数组使用`,`分隔.
+
+    Args:
+        schema (Any): 描述字段的json schema字典.
+
+    Returns:
+        Converter: 转换函数
+
+    """
+    _type = schema.get("type")
+    if not _type:
+        return _identity
+    if not isinstance(_type, str):
+        return _unsupported(_type)
+    scalar = _SCALAR_CONVERTERS.get(_type)
+    if scalar is not None:
+        return _identity if scalar is str else scalar
+    if _type != "array":
+        return _unsupported(_type)
+    item_info = schema.get("items")
+    if not item_info or item_info.get("type") == "string":
+        return _split
+    item_convert = build_converter(item_info)
+
+    def convert_array(value_str: str) -> List[Any]:
+        return [item_convert(i) for i in value_str.split(",")]
+    return convert_array
+
+
+class PropertyConverter:
+    """一个字段的转换器.
+
+    Attributes:
+        type (Any): 字段类型
+        from_string (Converter): 将一整个字符串(例如环境变量的值)转换为字段值,数组使用`,`分隔
+        from_argv (Optional[Converter]): 将一个命令行参数转换为字段值,数组字段转换的是其中的一个元素,
+            值不在`enum`中时抛出`ValueError`;布尔型等不从命令行读取值的字段为None
+
+    """
+    __slots__ = ("type", "from_string", "from_argv")
+
+    def __init__(self, schema: Any) -> None:
+        self.type = schema.get("type")
+        self.from_string = build_converter(schema)
+        self.from_argv: Optional[Converter] = None
+        value_schema = schema
+        if self.type == "array":
+            value_schema = schema.get("items") or {}
+        value_type = value_schema.get("type")
+        if isinstance(value_type, str) and value_type in _SCALAR_CONVERTERS and value_type != "boolean":
+            convert = _SCALAR_CONVERTERS[value_type]
+            choices = value_schema.get("enum")
+            self.from_argv = _with_choices(convert, choices) if choices else convert
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(fingerprint: str) -> Dict[str, PropertyConverter]:
+    schema = json.loads(fingerprint)
+    properties: Dict[str, Any] = schema.get("properties", {}) if isinstance(schema, dict) else {}
+    return {key: PropertyConverter(prop) for key, prop in properties.items() if isinstance(prop, dict)}
+
+
+def compile_converters(schema: Any) -> Dict[str, PropertyConverter]:
+    """为schema的每个字段构造转换器.
+
+    结果按保留key顺序的schema指纹缓存,相同schema得到的是同一个字典,字段顺序与schema中一致,调用方不应修改它.
+
+    Args:
+        schema (Any): 节点的json schema字典.
+
+    Returns:
+        Dict[str, PropertyConverter]: 字段名到转换器的映射
+
+    """
+    return _compile(schema_fingerprint(schema, sort_keys=False))
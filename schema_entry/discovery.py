@@ -0,0 +1,74 @@
+"""discovery.
+
+默认配置文件的查找.
+
+`default_config_file_paths`中通常列出了当前目录,用户目录,`/etc`等多个候选位置,其中大部分并不存在.
+这个模块按目录对候选路径分组,每个目录只用一次`os.scandir`列出其中的文件名并在进程内缓存,
+之后不在目录列表中的候选路径(包括目录本身不存在的情况)不再需要任何系统调用.
+目录列表中存在的候选路径仍会用`is_file()`确认,因此被删除的文件不会被误认为存在.
+
+缓存的目录列表在进程的整个生命周期内有效,运行期间新建了配置文件时需要调用`invalidate_config_file_lookup`,
+或者以`cached=False`调用`find_config_files`逐个检查候选路径.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+_listings: Dict[str, FrozenSet[str]] = {}
+_lock = threading.Lock()
+
+
+def _list_directory(directory: str) -> FrozenSet[str]:
+    with _lock:
+        listing = _listings.get(directory)
+    if listing is not None:
+        return listing
+    names = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                names.append(entry.name)
+    except OSError:
+        pass
+    listing = frozenset(names)
+    with _lock:
+        _listings[directory] = listing
+    return listing
+
+
+def find_config_files(paths: Sequence[str], cached: bool = True) -> List[Path]:
+    """找出候选路径中存在的文件.
+
+    Args:
+        paths (Sequence[str]): 候选路径.
+        cached (bool, optional): 是否使用缓存的目录列表,为False时逐个检查候选路径. Defaults to True.
+
+    Returns:
+        List[Path]: 存在的文件,按候选路径的顺序排列
+
+    """
+    if not cached:
+        return [p for p in map(Path, paths) if p.is_file()]
+    result = []
+    for p_str in paths:
+        directory, name = os.path.split(os.path.abspath(p_str))
+        if name in _list_directory(directory):
+            p = Path(p_str)
+            if p.is_file():
+                result.append(p)
+    return result
+
+
+def invalidate_config_file_lookup(directory: Optional[str] = None) -> None:
+    """清除缓存的目录列表.
+
+    Args:
+        directory (Optional[str], optional): 需要清除的目录,为None时清除全部. Defaults to None.
+
+    """
+    with _lock:
+        if directory is None:
+            _listings.clear()
+        else:
+            _listings.pop(os.path.abspath(directory), None)
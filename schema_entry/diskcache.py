@@ -0,0 +1,257 @@
+"""diskcache.
+
+配置文件解析结果的持久化缓存.
+
+短时运行的命令行程序每次启动都要重新解析大的yaml配置文件,进程内缓存对此无能为力.
+`DiskCache`把解析结果用`marshal`序列化后保存在缓存目录中,以文件指纹`(真实路径, st_mtime_ns, st_size, st_ino)`,
+解析函数的完整名字以及解释器,`schema_entry`和`pyyaml`的版本计算键,任何一个升级后旧的缓存都不会再被使用,之后启动的进程在文件没有变化时直接读取序列化的结果.
+
++ 写入先写临时文件再用`os.replace`替换,并发的进程不会读到写了一半的缓存
++ 缓存目录超过字节预算时按最近使用时间淘汰,命中的缓存文件会更新修改时间
++ 解析结果中有`marshal`不支持的类型(例如yaml中的日期)时不缓存
++ 局部定义的函数和lambda没有稳定的名字,使用它们作为解析函数时不缓存
++ 普通函数的键还包括其字节码,常量和引用的名字的摘要,修改解析函数的代码后旧的缓存不会再被使用;
+  但解析函数调用的其他函数或读取的其他文件变化时无法察觉,此时需要清空缓存或用环境变量关闭持久化缓存
++ 可调用对象可以用`cache_name`属性给出跨进程稳定的名字,`cache_name`为None时不缓存
++ 设置环境变量`SCHEMA_ENTRY_NO_DISK_CACHE`为非空值可以关闭持久化缓存,`SCHEMA_ENTRY_CACHE_DIR`可以指定缓存目录
+"""
+import os
+import sys
+import types
+import marshal
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+import yaml
+
+from .version import __version__
+from .frozen import thaw
+from .utils import atomic_write_bytes
+from .filecache import file_key, parser_identity
+
+DEFAULT_MAXBYTES = 256 * 1024 * 1024
+NO_DISK_CACHE_ENV = "SCHEMA_ENTRY_NO_DISK_CACHE"
+CACHE_DIR_ENV = "SCHEMA_ENTRY_CACHE_DIR"
+SUFFIX = ".marshal"
+
+
+class DiskCacheInfo(NamedTuple):
+    """持久化缓存的统计信息.
+
+    Attributes:
+        hits (int): 命中次数
+        misses (int): 未命中次数
+        writes (int): 写入缓存文件的次数
+        evictions (int): 淘汰的缓存文件数
+
+    """
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+
+
+def default_cache_dir() -> Path:
+    """获取默认的缓存目录.
+
+    依次使用环境变量`SCHEMA_ENTRY_CACHE_DIR`,`$XDG_CACHE_HOME/schema_entry`和`~/.cache/schema_entry`.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir)
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "schema_entry"
+    return Path.home() / ".cache" / "schema_entry"
+
+
+def _code_parts(code: types.CodeType) -> Iterator[bytes]:
+    yield code.co_code
+    yield repr(code.co_names).encode("utf-8")
+    for const in code.co_consts:
+        yield from _const_parts(const)
+
+
+def _const_parts(const: Any) -> Iterator[bytes]:
+    if isinstance(const, types.CodeType):
+        # 嵌套的代码对象的repr中有内存地址,需要递归展开
+        yield from _code_parts(const)
+    elif isinstance(const, frozenset):
+        # 集合的迭代顺序受字符串哈希随机化影响,排序后才能跨进程稳定
+        yield repr(sorted(b"".join(_const_parts(item)) for item in const)).encode("utf-8")
+    elif isinstance(const, tuple):
+        yield b"("
+        for item in const:
+            yield from _const_parts(item)
+        yield b")"
+    else:
+        yield repr(const).encode("utf-8")
+
+
+def parser_name(parser: Callable[[Path], Any]) -> Optional[str]:
+    """获取解析函数在不同进程间稳定的名字,局部函数和lambda返回None.
+
+    有`cache_name`属性的解析函数优先使用它,`cache_name`为None表示不使用持久化缓存.
+    普通函数的名字后附加其代码的摘要,函数的代码变化后名字也会变化.
+    """
+    func = parser_identity(parser)
+    if hasattr(func, "cache_name"):
+        cache_name = func.cache_name
+        if cache_name is None:
+            return None
+        return f"{type(func).__module__}:{cache_name}"
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None)
+    if not module or not qualname or "<" in qualname:
+        return None
+    code = getattr(func, "__code__", None)
+    if isinstance(code, types.CodeType):
+        digest = hashlib.sha256(b"\0".join(_code_parts(code))).hexdigest()
+        return f"{module}:{qualname}#{digest[:16]}"
+    return f"{module}:{qualname}"
+
+
+class DiskCache:
+    """配置文件解析结果的持久化缓存.
+
+    Args:
+        directory (Optional[Path]): 缓存目录,为None时每次使用时通过`default_cache_dir()`获取. Defaults to None.
+        maxbytes (int): 缓存目录的字节预算. Defaults to DEFAULT_MAXBYTES.
+
+    """
+
+    def __init__(self, directory: Optional[Path] = None, maxbytes: int = DEFAULT_MAXBYTES) -> None:
+        self._directory = directory
+        self.maxbytes = maxbytes
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory if self._directory is not None else default_cache_dir()
+
+    @property
+    def disabled(self) -> bool:
+        """是否通过环境变量关闭了持久化缓存."""
+        return bool(os.environ.get(NO_DISK_CACHE_ENV))
+
+    def cache_path(self, p: Path, parser: Callable[[Path], Any]) -> Optional[Path]:
+        """获取配置文件对应的缓存文件路径,解析函数没有稳定的名字时返回None."""
+        name = parser_name(parser)
+        if name is None:
+            return None
+        realpath, mtime_ns, size, ino = file_key(p)
+        key = (f"{sys.version_info[0]}.{sys.version_info[1]}|{marshal.version}|{__version__}|{yaml.__version__}|"
+               f"{name}|{realpath}|{mtime_ns}|{size}|{ino}")
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}{SUFFIX}"
+
+    def load(self, p: Path, parser: Callable[[Path], Any]) -> Any:
+        """读取配置文件,有可用的缓存时直接读取缓存.
+
+        Args:
+            p (Path): 配置文件路径.
+            parser (Callable[[Path], Any]): 解析函数.
+
+        Returns:
+            Any: 解析结果
+
+        """
+        if self.disabled:
+            return parser(p)
+        cache_path = self.cache_path(p, parser)
+        if cache_path is None:
+            return parser(p)
+        try:
+            with open(cache_path, "rb") as f:
+                result = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            with self._lock:
+                self._hits += 1
+            return result
+        with self._lock:
+            self._misses += 1
+        result = parser(p)
+        try:
+            data = marshal.dumps(thaw(result))
+        except ValueError:
+            return result
+        if len(data) <= self.maxbytes:
+            self._write(cache_path, data)
+        return result
+
+    def _write(self, cache_path: Path, data: bytes) -> None:
+        try:
+            atomic_write_bytes(cache_path, data)
+        except OSError:
+            return
+        with self._lock:
+            self._writes += 1
+        self.evict()
+
+    def evict(self) -> int:
+        """按最近使用时间淘汰缓存文件直到缓存目录不超过字节预算.
+
+        Returns:
+            int: 淘汰的缓存文件数
+
+        """
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(SUFFIX) and entry.is_file():
+                        st = entry.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                        total += st.st_size
+        except OSError:
+            return 0
+        evicted = 0
+        if total > self.maxbytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.maxbytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._evictions += evicted
+        return evicted
+
+    def clear(self) -> None:
+        """删除缓存目录中的全部缓存文件并清空统计信息."""
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(SUFFIX):
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+        with self._lock:
+            self._hits = self._misses = self._writes = self._evictions = 0
+
+    def info(self) -> DiskCacheInfo:
+        """获取缓存的统计信息."""
+        with self._lock:
+            return DiskCacheInfo(self._hits, self._misses, self._writes, self._evictions)
+
+
+# 进程内共享的默认持久化缓存
+persistent_cache = DiskCache()
@@ -16,16 +16,34 @@ import json
 import warnings
 import argparse
 import functools
-from copy import deepcopy
+import threading
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Sequence, Dict, List, Any, Tuple, Optional, Union, cast
-from jsonschema import validate
+from typing import Callable, Sequence, Dict, List, Mapping, Any, Tuple, Optional, Union, Set, Type, cast, overload
 import yaml
 
-from .protocol import SUPPORT_SCHEMA
-from .utils import get_parent_tree, parse_value_string_by_schema, parse_schema_as_cmd, pydantic_schema_to_protocol
+from .frozen import FrozenDict, freeze, thaw
+from .layered import LayeredConfig
+from .fastparse import ArgvTable, build_argv_table
+from .lazy import LazySubcmd
+from .envsource import EnvSource
+from .compiled_schema import CompiledSchema, compile_schema
+from .filecache import FileKey, config_file_cache, file_key
+from .diskcache import persistent_cache
+from .extract import SelectiveParser
+from .discovery import find_config_files, invalidate_config_file_lookup
+from .binary import is_binary_ref, resolve_binary_ref, check_binary_array, without_binary_properties
+from .snapshot import snapshot_fingerprint, dump_snapshot, load_snapshot
+from .config_codecs import get_config_codec
+from .compression import CompressedCodec, split_compression_suffix
+from .validator import SchemaValidator, cached_validate, get_validator, record_validator_hit, check_support_schema
+from .utils import get_parent_tree, parse_value_string_by_schema, parse_schema_as_cmd, pydantic_schema_to_protocol, schema_fingerprint, LazyHelpArgumentParser
 from .entrypoint_base import SchemaType, PropertyType, EntryPointABC, PydanticModelLike, CallerReturnType
 
+# 已经通过`SUPPORT_SCHEMA`校验的(节点类,schema指纹),进程内每个组合只校验一次
+_checked_schemas: Set[Tuple[Type["EntryPoint"], str]] = set()
+
 
 class EntryPoint(EntryPointABC):
     epilog = ""
@@ -35,25 +53,44 @@ class EntryPoint(EntryPointABC):
 
     schema = None
     verify_schema = True
+    lazy_check_schema = False
 
     default_config_file_paths: List[str] = []
     config_file_only_get_need = True
     load_all_config_file = False
+    concurrent_config_file = False
+    cache_config_file = True
+    cache_config_file_lookup = True
+    persistent_config_cache = False
+    config_snapshot = False
+    watch_config_file = False
+    watch_interval = 1.0
+    pass_frozen_config = False
     env_prefix = None
     parse_env = True
 
     argparse_check_required = False
     argparse_noflag: Optional[str] = None
+    argparse_fast = False
     _config_file_parser_map: Dict[str, Callable[[Path], Dict[str, Any]]] = {}
 
     def _check_schema(self) -> None:
         if self.schema is not None:
+            key = (self.__class__, schema_fingerprint(self.schema))
+            if key in _checked_schemas:
+                return
             try:
-                validate(instance=self.schema, schema=SUPPORT_SCHEMA)
+                check_support_schema(self.schema)
             except Exception as e:
                 warnings.warn(str(e))
                 raise e
                 # sys.exit(1)
+            _checked_schemas.add(key)
+
+    def _ensure_schema_checked(self) -> None:
+        if not self._schema_checked:
+            self._check_schema()
+            self._schema_checked = True
 
     def __init__(self, *,
                  description: Optional[str] = None,
@@ -62,13 +99,23 @@ class EntryPoint(EntryPointABC):
                  name: Optional[str] = None,
                  schema: Optional[SchemaType] = None,
                  verify_schema: Optional[bool] = None,
+                 lazy_check_schema: Optional[bool] = None,
                  default_config_file_paths: Optional[List[str]] = None,
                  config_file_only_get_need: Optional[bool] = None,
                  load_all_config_file: Optional[bool] = None,
+                 concurrent_config_file: Optional[bool] = None,
+                 cache_config_file: Optional[bool] = None,
+                 cache_config_file_lookup: Optional[bool] = None,
+                 persistent_config_cache: Optional[bool] = None,
+                 config_snapshot: Optional[bool] = None,
+                 watch_config_file: Optional[bool] = None,
+                 watch_interval: Optional[float] = None,
+                 pass_frozen_config: Optional[bool] = None,
                  env_prefix: Optional[str] = None,
                  parse_env: Optional[bool] = None,
                  argparse_check_required: Optional[bool] = None,
                  argparse_noflag: Optional[str] = None,
+                 argparse_fast: Optional[bool] = None,
                  config_file_parser_map: Optional[Dict[str, Callable[[
                      Path], Dict[str, Any]]]] = None,
                  main: Optional[Callable[..., Optional[Any]]] = None
@@ -84,13 +131,23 @@ class EntryPoint(EntryPointABC):
             name (Optional[str], optional): 节点的name属性. Defaults to None.
             schema (Optional[Dict[str, Union[str, List[str], Dict[str, Dict[str, Any]]]]], optional): 节点的校验json schema. Defaults to None.
             verify_schema (Optional[bool], optional): 配置是否校验schema. Defaults to None.
+            lazy_check_schema (Optional[bool], optional): 是否推迟到节点第一次解析参数时才检查schema是否受支持. Defaults to None.
             default_config_file_paths (Optional[List[str]], optional): 默认配置文件路径列表. Defaults to None.
             config_file_only_get_need (Optional[bool], optional): 设置是否在加载配置文件时只获取schema中定义的内容. Defaults to None.
             load_all_config_file (Optional[bool], optional): 是否尝试加载全部指定的配置文件路径下的配置文件. Defaults to None.
+            concurrent_config_file (Optional[bool], optional): 加载全部配置文件时是否在线程池中并发读取和解析. Defaults to None.
+            cache_config_file (Optional[bool], optional): 是否在进程内缓存配置文件的解析结果. Defaults to None.
+            cache_config_file_lookup (Optional[bool], optional): 查找默认配置文件时是否使用进程内缓存的目录列表. Defaults to None.
+            persistent_config_cache (Optional[bool], optional): 是否在缓存目录中持久化缓存yaml和自定义格式配置文件的解析结果. Defaults to None.
+            config_snapshot (Optional[bool], optional): 叶子节点是否支持`--dump-resolved-config`和`--from-snapshot`配置快照参数. Defaults to None.
+            watch_config_file (Optional[bool], optional): 执行函数运行期间是否轮询配置文件的变化并重新加载配置. Defaults to None.
+            watch_interval (Optional[float], optional): 轮询配置文件的间隔秒数. Defaults to None.
+            pass_frozen_config (Optional[bool], optional): 执行函数和重新加载的回调函数是否直接收到只读的配置而不是可写的副本. Defaults to None.
             env_prefix (Optional[str], optional): 设置环境变量的前缀. Defaults to None.
             parse_env (Optional[bool], optional): 设置是否加载环境变量. Defaults to None.
             argparse_check_required (Optional[bool], optional): 设置是否构造叶子节点命令行时指定schema中定义为必须的参数项为必填项. Defaults to None.
             argparse_noflag (Optional[str], optional): 指定命令行中noflag的参数. Defaults to None.
+            argparse_fast (Optional[bool], optional): 设置叶子节点是否优先使用根据schema构造的参数表快速解析命令行. Defaults to None.
             config_file_parser_map (Optional[Dict[str, Callable[[Path], Dict[str, Any]]]], optional): 设置自定义配置文件名的解析映射. Defaults to None.
             main (Optional[Callable[..., None]], optional): 设置作为入口的执行函数. Defaults to None.
         """
@@ -106,12 +163,30 @@ class EntryPoint(EntryPointABC):
             self.schema = schema
         if verify_schema is not None:
             self.verify_schema = verify_schema
+        if lazy_check_schema is not None:
+            self.lazy_check_schema = lazy_check_schema
         if default_config_file_paths is not None:
             self.default_config_file_paths = default_config_file_paths
         if config_file_only_get_need is not None:
             self.config_file_only_get_need = config_file_only_get_need
         if load_all_config_file is not None:
             self.load_all_config_file = load_all_config_file
+        if concurrent_config_file is not None:
+            self.concurrent_config_file = concurrent_config_file
+        if cache_config_file is not None:
+            self.cache_config_file = cache_config_file
+        if cache_config_file_lookup is not None:
+            self.cache_config_file_lookup = cache_config_file_lookup
+        if persistent_config_cache is not None:
+            self.persistent_config_cache = persistent_config_cache
+        if config_snapshot is not None:
+            self.config_snapshot = config_snapshot
+        if watch_config_file is not None:
+            self.watch_config_file = watch_config_file
+        if watch_interval is not None:
+            self.watch_interval = watch_interval
+        if pass_frozen_config is not None:
+            self.pass_frozen_config = pass_frozen_config
         if env_prefix is not None:
             self.env_prefix = env_prefix
         if parse_env is not None:
@@ -120,6 +195,8 @@ class EntryPoint(EntryPointABC):
             self.argparse_check_required = argparse_check_required
         if argparse_noflag is not None:
             self.argparse_noflag = argparse_noflag
+        if argparse_fast is not None:
+            self.argparse_fast = argparse_fast
         if config_file_parser_map is not None:
             self._config_file_parser_map = config_file_parser_map
         if config_file_parser_map is not None:
@@ -128,11 +205,29 @@ class EntryPoint(EntryPointABC):
             self._main = main
         else:
             self._main = None
+        self._reload_callback: Optional[Callable[..., Optional[Any]]] = None
 
-        self._check_schema()
+        self._schema_checked = False
+        if not self.lazy_check_schema:
+            self._ensure_schema_checked()
         self._subcmds = {}
+        self._subcmd_epilog: Optional[str] = None
+        self._prog: Optional[str] = None
+        self._env_key_cache: Optional[Tuple[Optional[SchemaType], Optional[str], str, Dict[str, str], Dict[str, List[str]]]] = None
+        self._call_env: Optional[Mapping[str, str]] = None
+        self._compiled_schema_cache: Optional[Tuple[SchemaType, CompiledSchema]] = None
+        self._validator_cache: Optional[Tuple[SchemaType, SchemaValidator]] = None
 
         self._config = {}
+        self._config_view: Optional[FrozenDict] = None
+        self._config_layers: Optional[LayeredConfig] = None
+        self._config_file_timings: Dict[str, float] = {}
+        self._cmd_config_path: Optional[Path] = None
+        self._watch_stats: Optional[Dict[str, Optional[FileKey]]] = None
+        self._watch_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+        self._parser_cache: Optional[Tuple[Tuple[Any, ...], argparse.ArgumentParser]] = None
+        self._argv_table_cache: Optional[Tuple[argparse.ArgumentParser, Optional[ArgvTable]]] = None
 
     @property
     def name(self) -> str:
@@ -140,23 +235,82 @@ class EntryPoint(EntryPointABC):
 
     @property
     def prog(self) -> str:
-        parent_list = get_parent_tree(self)
-        parent_list.append(self.name)
-        return " ".join(parent_list)
+        if self._prog is None:
+            parent_list = get_parent_tree(self)
+            parent_list.append(self.name)
+            self._prog = " ".join(parent_list)
+        return self._prog
+
+    def _invalidate_prog(self) -> None:
+        """节点的父节点或名字变化后清除它和它所有子孙节点缓存的命令路径和环境变量名."""
+        self._prog = None
+        self._env_key_cache = None
+        for subcmd in self._subcmds.values():
+            if isinstance(subcmd, EntryPoint):
+                subcmd._invalidate_prog()
 
     @property
     def config(self) -> Dict[str, Any]:
-        return deepcopy(self._config)
+        view = self._config_view
+        if view is None:
+            view = self._config_view = freeze(self._config)
+        return view
+
+    @property
+    def config_layers(self) -> Optional[LayeredConfig]:
+        return self._config_layers
+
+    @property
+    def config_file_timings(self) -> Dict[str, float]:
+        return dict(self._config_file_timings)
+
+    def config_source(self, key: str) -> Optional[str]:
+        if self._config_layers is None:
+            return None
+        return self._config_layers.source_of(key)
 
     def regist_subcmd(self, subcmd: EntryPointABC) -> None:
         subcmd.parent = self
         self._subcmds[subcmd.name] = subcmd
+        self._subcmd_epilog = None
+        if isinstance(subcmd, EntryPoint):
+            subcmd._invalidate_prog()
 
+    @overload
     def regist_sub(self, subcmdclz: type, **kwargs: Any) -> EntryPointABC:
+        ...
+
+    @overload
+    def regist_sub(self, subcmdclz: str, *, name: str, description: Optional[str] = None, **kwargs: Any) -> LazySubcmd:
+        ...
+
+    def regist_sub(self, subcmdclz: Union[type, str], **kwargs: Any) -> Union[EntryPointABC, LazySubcmd]:
+        if isinstance(subcmdclz, str):
+            name = kwargs.pop("name", None)
+            if not name:
+                raise ValueError("使用导入路径注册子命令时必须指定name")
+            lazy = LazySubcmd(subcmdclz, name, kwargs.pop("description", None), **kwargs)
+            lazy.parent = self
+            self._subcmds[name] = lazy
+            self._subcmd_epilog = None
+            return lazy
         instance = subcmdclz(**kwargs)
         self.regist_subcmd(instance)
         return instance
 
+    def _get_subcmd(self, name: str) -> Optional[EntryPointABC]:
+        subcmd = self._subcmds.get(name)
+        if isinstance(subcmd, LazySubcmd):
+            return subcmd.load()
+        return subcmd
+
+    def check_tree(self) -> None:
+        self._ensure_schema_checked()
+        for name in list(self._subcmds):
+            subcmd = self._get_subcmd(name)
+            if subcmd is not None:
+                subcmd.check_tree()
+
     def as_main(self, func: Callable[..., Optional[Any]]) -> Callable[..., Optional[Any]]:
         @functools.wraps(func)
         def warp(*args: Any, **kwargs: Any) -> Optional[Any]:
@@ -165,6 +319,14 @@ class EntryPoint(EntryPointABC):
         self._main = warp
         return warp
 
+    def on_config_reload(self, func: Callable[..., Optional[Any]]) -> Callable[..., Optional[Any]]:
+        @functools.wraps(func)
+        def warp(*args: Any, **kwargs: Any) -> Optional[Any]:
+            return func(*args, **kwargs)
+
+        self._reload_callback = warp
+        return warp
+
     def with_schema(self, schemaObj: Union[str, dict, PydanticModelLike]) -> Union[str, dict, PydanticModelLike]:
         """注册schema
 
@@ -182,60 +344,141 @@ class EntryPoint(EntryPointABC):
             schema = schemaObj.model_json_schema()
             self.schema = cast(SchemaType, pydantic_schema_to_protocol(schema))
             self._name = schemaObj.__name__.lower()
+            self._invalidate_prog()
             self.__doc__ = schemaObj.__doc__
         return schemaObj
 
-    def __call__(self, argv: Sequence[str]) -> Optional[CallerReturnType]:
+    def _render_subcmd_epilog(self) -> str:
+        """生成列出子命令描述的epilog,结果会被缓存到注册新的子命令为止."""
+        if self._subcmd_epilog is None:
+            epilog = "子命令描述:\n"
+            rows = []
+            for subcmd, ins in self._subcmds.items():
+                if ins.__doc__ and isinstance(ins.__doc__, str):
+                    desc = ins.__doc__.splitlines()[0]
+                    rows.append(f"{subcmd}\t{desc}")
+                else:
+                    rows.append(f"{subcmd}")
+            epilog += "\n".join(rows)
+            self._subcmd_epilog = epilog
+        return self._subcmd_epilog
+
+    def _new_parser(self) -> argparse.ArgumentParser:
+        if len(self._subcmds) == 0:
+            return argparse.ArgumentParser(
+                prog=self.prog,
+                epilog=self.epilog,
+                description=self.__doc__,
+                usage=self.usage)
+        return LazyHelpArgumentParser(
+            prog=self.prog,
+            epilog=self.epilog,
+            description=self.__doc__,
+            usage=self.usage,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog_factory=None if self.epilog else self._render_subcmd_epilog)
+
+    def _parser_key(self) -> Tuple[Any, ...]:
+        return (self.prog, self.usage, self.epilog, self.__doc__, self.schema,
+                self.argparse_noflag, self.argparse_check_required, self.config_snapshot, tuple(self._subcmds))
+
+    def _is_prepared_parser(self, parser: argparse.ArgumentParser) -> bool:
+        return self._parser_cache is not None and self._parser_cache[1] is parser
+
+    def _get_parser(self) -> argparse.ArgumentParser:
+        """获取节点的命令行解析器.
+
+        解析器会被缓存,直到节点的schema,`argparse_noflag`,`argparse_check_required`,子命令集合或帮助信息发生变化.
+        如果子类覆写了接收解析器的`pass_args_to_sub`,`parse_args`或`parse_commandline_args`,它们可能会向解析器中添加参数,此时每次都构造新的解析器.
+        """
+        cls = type(self)
+        if len(self._subcmds) == 0:
+            overridden = cls.parse_commandline_args is not EntryPoint.parse_commandline_args or cls.parse_args is not EntryPoint.parse_args
+        else:
+            overridden = cls.pass_args_to_sub is not EntryPoint.pass_args_to_sub
+        if overridden:
+            return self._new_parser()
+        key = self._parser_key()
+        if self._parser_cache is not None and self._parser_cache[0] == key:
+            return self._parser_cache[1]
+        parser = self._new_parser()
+        if len(self._subcmds) == 0:
+            self._add_config_argument(parser)
+            if self.schema:
+                self._make_commandline_parse_by_schema(parser)
+        else:
+            self._add_subcmd_argument(parser)
+        self._parser_cache = (key, parser)
+        return parser
+
+    def __call__(self, argv: Sequence[str], *, env: Optional[Mapping[str, str]] = None) -> Optional[CallerReturnType]:
         if not self.usage:
             if len(self._subcmds) == 0:
                 self.usage = f"{self.prog} [options]"
             else:
                 self.usage = f"{self.prog} [subcmd]"
-        parser = argparse.ArgumentParser(
-            prog=self.prog,
-            epilog=self.epilog,
-            description=self.__doc__,
-            usage=self.usage)
-        if len(self._subcmds) != 0:
-            if self.epilog:
-                epilog = self.epilog
-            else:
-                epilog = "子命令描述:\n"
-                rows = []
-                for subcmd, ins in self._subcmds.items():
-                    if ins.__doc__ and isinstance(ins.__doc__, str):
-                        desc = ins.__doc__.splitlines()[0]
-                        rows.append(f"{subcmd}\t{desc}")
-                    else:
-                        rows.append(f"{subcmd}")
-                epilog += "\n".join(rows)
-            parser = argparse.ArgumentParser(
-                prog=self.prog,
-                epilog=epilog,
-                description=self.__doc__,
-                usage=self.usage,
-                formatter_class=argparse.RawDescriptionHelpFormatter)
-            return self.pass_args_to_sub(parser, argv)
+        self._call_env = env
+        try:
+            if len(self._subcmds) != 0:
+                node, depth = self._resolve_subcmd(argv)
+                if depth == 0:
+                    return self.pass_args_to_sub(self._get_parser(), argv)
+                return self._call_subcmd(node, argv[depth:])
 
-        else:
-            parser = argparse.ArgumentParser(
-                prog=self.prog,
-                epilog=self.epilog,
-                description=self.__doc__,
-                usage=self.usage)
-            result = self.parse_args(parser, argv)
-            if result is None:
-                return result
             else:
-                return {"caller": self.name, "result": result}
+                self._ensure_schema_checked()
+                result = self.parse_args(self._get_parser(), argv)
+                if result is None:
+                    return result
+                else:
+                    return {"caller": self.name, "result": result}
+        finally:
+            self._call_env = None
 
-    def pass_args_to_sub(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Optional[CallerReturnType]:
+    def _call_subcmd(self, subcmd: EntryPointABC, argv: Sequence[str]) -> Optional[CallerReturnType]:
+        """调用子节点,调用时传入了环境变量则继续传给子节点."""
+        if self._call_env is None:
+            return subcmd(argv)
+        return subcmd(argv, env=self._call_env)
+
+    def _resolve_subcmd(self, argv: Sequence[str]) -> Tuple[EntryPointABC, int]:
+        """沿子命令树一次性解析出命令路径.
+
+        各节点的`_subcmds`构成了一棵以子命令名为边的前缀树,从本节点开始逐个匹配命令行参数,
+        直到遇到叶子节点,无法识别的参数或覆写了分发行为的节点为止,中间节点不再构造命令行解析器.
+
+        Args:
+            argv (Sequence[str]): 命令行参数序列
+
+        Returns:
+            Tuple[EntryPointABC, int]: 匹配到的最深节点和匹配掉的参数个数
+        """
+        node: EntryPointABC = self
+        depth = 0
+        while depth < len(argv) and isinstance(node, EntryPoint) and node._subcmds and node._is_plain_dispatcher():
+            child = node._get_subcmd(argv[depth])
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return node, depth
+
+    def _is_plain_dispatcher(self) -> bool:
+        cls = type(self)
+        return cls.__call__ is EntryPoint.__call__ and cls.pass_args_to_sub is EntryPoint.pass_args_to_sub
+
+    def _add_subcmd_argument(self, parser: argparse.ArgumentParser) -> None:
         scmds = list(self._subcmds.keys())
         scmdss = ",".join(scmds)
         parser.add_argument('subcmd', help=f'执行子命令，可选的子命有{scmdss}')
+
+    def pass_args_to_sub(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Optional[CallerReturnType]:
+        if not self._is_prepared_parser(parser):
+            self._add_subcmd_argument(parser)
         args = parser.parse_args(argv[0:1])
-        if self._subcmds.get(args.subcmd):
-            return self._subcmds[args.subcmd](argv[1:])
+        subcmd = self._get_subcmd(args.subcmd)
+        if subcmd is not None:
+            return self._call_subcmd(subcmd, argv[1:])
         else:
             print(f'未知的子命令 `{argv[0]}`')
             parser.print_help()
@@ -245,9 +488,10 @@ class EntryPoint(EntryPointABC):
         if self.schema is None:
             raise AttributeError("此处不该被执行")
         else:
+            compiled = self._get_compiled_schema()
             properties: Dict[str, PropertyType] = self.schema.get(
                 "properties", {})
-            requireds: List[str] = self.schema.get("required", [])
+            requireds = compiled.required if compiled is not None else frozenset()
             for key, prop in properties.items():
                 required = False
                 noflag = False
@@ -260,49 +504,59 @@ class EntryPoint(EntryPointABC):
                     key, prop, parser, required=required, noflag=noflag)
             return parser
 
+    def _fast_parse_commandline_args(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """使用参数表快速解析命令行.
+
+        只有在开启了`argparse_fast`且解析器是节点自己构造的解析器时才会使用,无法快速解析时返回None.
+        """
+        if not self.argparse_fast or not self._is_prepared_parser(parser):
+            return None
+        if self._argv_table_cache is None or self._argv_table_cache[0] is not parser:
+            table = build_argv_table(self.schema, noflag=self.argparse_noflag, check_required=self.argparse_check_required)
+            self._argv_table_cache = (parser, table)
+        table = self._argv_table_cache[1]
+        if table is None:
+            return None
+        return table.parse(argv)
+
     def _parse_commandline_args_by_schema(self,
                                           parser: argparse.ArgumentParser,
                                           argv: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-        if self.schema:
-            parser = self._make_commandline_parse_by_schema(parser)
-        args = parser.parse_args(argv)
+        parsed = self._fast_parse_commandline_args(parser, argv)
+        if parsed is None:
+            if self.schema and not self._is_prepared_parser(parser):
+                parser = self._make_commandline_parse_by_schema(parser)
+            parsed = vars(parser.parse_args(argv))
         config_file_res: Dict[str, Any] = {}
         cmd_res: Dict[str, Any] = {}
-        for key, value in vars(args).items():
+        compiled = self._get_compiled_schema()
+        self._cmd_config_path = None
+        for key, value in parsed.items():
             if key == "config":
                 if value:
-                    p = Path(value)
-                    if not p.is_file():
-                        warnings.warn(f"{str(p)}不是文件")
-                        continue
-                    if p.suffix == ".json":
-                        config_file_res = self.parse_json_configfile_args(p)
-                    elif p.suffix == ".yml":
-                        config_file_res = self.parse_yaml_configfile_args(p)
-                    else:
-                        warnings.warn(f"跳过不支持的配置格式的文件{str(p)}")
-                        continue
+                    self._cmd_config_path = Path(value)
+                    config_file_res = self._read_cmd_config_file(self._cmd_config_path)
                 else:
                     continue
             else:
-                try:
-                    if self.schema is not None and self.schema.get("properties") is not None:
-                        if self.schema["properties"].get(key) is not None and self.schema["properties"][key]["type"] == "boolean":
-                            if value is False:
-                                if self.schema.get("required") is None:
-                                    value = None
-                                else:
-                                    if key not in self.schema["required"]:
-                                        value = None
-                except Exception as e:
-                    warnings.warn(str(e))
-                finally:
-                    if value is not None:
-                        cmd_res.update({
-                            key: value
-                        })
+                # 未在命令行中指定的非必填布尔型字段不覆盖其他来源的配置
+                if value is False and compiled is not None and key in compiled.boolean_keys and key not in compiled.required:
+                    value = None
+                if value is not None:
+                    cmd_res[key] = value
         return config_file_res, cmd_res
 
+    def _read_cmd_config_file(self, p: Path) -> Dict[str, Any]:
+        """读取命令行指定的配置文件,文件不存在或格式不支持时返回空字典."""
+        if not p.is_file():
+            warnings.warn(f"{str(p)}不是文件")
+            return {}
+        parfunc = self._get_config_file_parser(p)
+        if parfunc is None:
+            warnings.warn(f"跳过不支持的配置格式的文件{str(p)}")
+            return {}
+        return self._load_binary_fields(self.read_config_file(p, parfunc), p)
+
     def parse_commandline_args(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """解析命令行获得参数
 
@@ -314,33 +568,167 @@ class EntryPoint(EntryPointABC):
             Tuple[Dict[str, Any], Dict[str, Any]]: 命令行指定配置文件获得的参数,其他命令行参数获得的参数
         """
 
-        parser.add_argument("-c", "--config", type=str, help='指定配置文件位置')
+        if not self._is_prepared_parser(parser):
+            self._add_config_argument(parser)
         return self._parse_commandline_args_by_schema(parser, argv)
 
-    def _parse_env_args(self, key: str, info: PropertyType) -> Any:
-        if self.env_prefix:
-            env_prefix = self.env_prefix.upper()
+    def _add_config_argument(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument("-c", "--config", type=str, help='指定配置文件位置')
+        if self.config_snapshot:
+            parser.add_argument("--dump-resolved-config", metavar="PATH", type=str, help='校验通过后将最终配置写入快照文件')
+            parser.add_argument("--from-snapshot", metavar="PATH", type=str, help='输入没有变化时直接使用快照文件中的配置')
+
+    def _split_snapshot_args(self, argv: Sequence[str]) -> Tuple[List[str], Optional[str], Optional[str]]:
+        """从命令行参数中分离出快照参数.
+
+        Returns:
+            Tuple[List[str], Optional[str], Optional[str]]: 其余的命令行参数,`--from-snapshot`和`--dump-resolved-config`指定的路径
+        """
+        if not self.config_snapshot:
+            return list(argv), None, None
+        rest: List[str] = []
+        paths: Dict[str, Optional[str]] = {"--from-snapshot": None, "--dump-resolved-config": None}
+        i = 0
+        while i < len(argv):
+            arg = argv[i]
+            if arg == "--":
+                rest.extend(argv[i:])
+                break
+            name, eq, value = arg.partition("=")
+            if name in paths:
+                if not eq:
+                    if i + 1 >= len(argv):
+                        raise SystemExit(f"{name}需要指定路径")
+                    i += 1
+                    value = argv[i]
+                paths[name] = value
+            else:
+                rest.append(arg)
+            i += 1
+        return rest, paths["--from-snapshot"], paths["--dump-resolved-config"]
+
+    def _snapshot_fingerprint(self, argv: Sequence[str]) -> str:
+        """计算配置快照的输入指纹.
+
+        指纹包含节点,schema,影响配置解析的节点选项,默认配置文件和命令行指定配置文件的文件指纹,节点前缀下的环境变量以及命令行参数.
+        """
+        paths = list(self.default_config_file_paths)
+        i = 0
+        while i < len(argv) and argv[i] != "--":
+            name, eq, value = argv[i].partition("=")
+            if name == "-c" or (len(name) > 2 and "--config".startswith(name)):
+                if not eq and i + 1 < len(argv):
+                    i += 1
+                    value = argv[i]
+                paths.append(value)
+            elif name.startswith("-c") and not name.startswith("--"):
+                paths.append(argv[i][2:])
+            i += 1
+        files: List[Any] = []
+        for path in paths:
+            try:
+                files.append(file_key(Path(path)))
+            except OSError:
+                files.append([path, None])
+        env: Dict[str, str] = {}
+        if self.schema and self.parse_env:
+            env = self._get_env_source().with_prefix(self._get_env_index()[0])
+        return snapshot_fingerprint([
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.prog,
+            schema_fingerprint(self.schema, sort_keys=False),
+            [self.config_file_only_get_need, self.load_all_config_file, self.verify_schema, self.parse_env, self.env_prefix,
+             self.argparse_noflag, self.argparse_check_required, sorted(self._config_file_parser_map)],
+            files,
+            env,
+            list(argv)
+        ])
+
+    def _get_compiled_schema(self) -> Optional[CompiledSchema]:
+        """获取编译后的schema,在schema被替换时重新获取,没有schema时返回None."""
+        if not self.schema:
+            return None
+        cache = self._compiled_schema_cache
+        if cache is None or cache[0] is not self.schema:
+            cache = self._compiled_schema_cache = (self.schema, compile_schema(self.schema))
+        return cache[1]
+
+    def _get_validator(self) -> Optional[SchemaValidator]:
+        """获取schema的校验器,在schema被替换时重新获取,没有schema时返回None.
+
+        校验器按schema的身份缓存在节点上,重复校验时不再计算schema指纹,复用计入`validator_cache_info()`的命中次数.
+        """
+        if not self.schema:
+            return None
+        cache = self._validator_cache
+        if cache is None or cache[0] is not self.schema:
+            cache = self._validator_cache = (self.schema, get_validator(self.schema))
         else:
-            env_prefix = self.prog.replace(" ", "_").upper()
-        key = key.replace("-", "_")
-        env = os.environ.get(f"{env_prefix}_{key.upper()}")
+            record_validator_hit()
+        return cache[1]
+
+    def _get_env_index(self) -> Tuple[str, Dict[str, str], Dict[str, List[str]]]:
+        """获取环境变量前缀,各字段对应的环境变量名以及环境变量名到字段的反查表.
+
+        结果会被缓存,在schema或`env_prefix`被替换,或者节点的命令路径变化时重新计算.
+        """
+        cache = self._env_key_cache
+        if cache is None or cache[0] is not self.schema or cache[1] != self.env_prefix:
+            if self.env_prefix:
+                env_prefix = self.env_prefix.upper()
+            else:
+                env_prefix = self.prog.replace(" ", "_").upper()
+            compiled = self._get_compiled_schema()
+            keys = compiled.keys if compiled is not None else ()
+            env_keys = {key: f"{env_prefix}_{key.replace('-', '_').upper()}" for key in keys}
+            env_names: Dict[str, List[str]] = {}
+            for key, env_key in env_keys.items():
+                env_names.setdefault(env_key, []).append(key)
+            cache = self._env_key_cache = (self.schema, self.env_prefix, env_prefix, env_keys, env_names)
+        return cache[2], cache[3], cache[4]
+
+    def _get_env_source(self) -> EnvSource:
+        return EnvSource(self._call_env)
+
+    def _parse_env_args(self, key: str, info: PropertyType) -> Any:
+        env_prefix, env_keys, _ = self._get_env_index()
+        env_key = env_keys.get(key)
+        if env_key is None:
+            env_key = f"{env_prefix}_{key.replace('-', '_').upper()}"
+        # 只查一个变量时直接查询,不为此复制整个环境变量
+        env = (os.environ if self._call_env is None else self._call_env).get(env_key)
         if not env:
             env = None
         else:
-            env = parse_value_string_by_schema(info, env)
+            compiled = self._get_compiled_schema()
+            converter = compiled.converters.get(key) if compiled is not None else None
+            env = converter.from_string(env) if converter is not None else parse_value_string_by_schema(info, env)
         return env
 
     def parse_env_args(self) -> Dict[str, Any]:
+        """解析环境变量中的配置.
+
+        默认对环境变量做一次快照并只遍历带有节点前缀的变量;子类覆写了`_parse_env_args`时仍逐个字段调用它.
+        """
         properties: Dict[str, Any]
         if self.schema and self.parse_env:
             properties = self.schema.get("properties", {})
             result = {}
-            for key, info in properties.items():
-                value = self._parse_env_args(key, info)
-                if value is not None:
-                    result.update({
-                        key: value
-                    })
+            if type(self)._parse_env_args is not EntryPoint._parse_env_args:
+                for key, info in properties.items():
+                    value = self._parse_env_args(key, info)
+                    if value is not None:
+                        result[key] = value
+                return result
+            env_prefix, _, env_names = self._get_env_index()
+            compiled = self._get_compiled_schema()
+            converters = compiled.converters if compiled is not None else {}
+            for env_key, env in self._get_env_source().with_prefix(env_prefix).items():
+                for key in env_names.get(env_key, ()):
+                    converter = converters.get(key)
+                    value = converter.from_string(env) if converter is not None else parse_value_string_by_schema(properties[key], env)
+                    if value is not None:
+                        result[key] = value
             return result
         else:
             return {}
@@ -355,14 +743,25 @@ class EntryPoint(EntryPointABC):
             Dict[str, Any]: 筛选过后的参数
         """
         if self.config_file_only_get_need and self.schema is not None and self.schema.get("properties") is not None:
-            needs = list(self.schema["properties"].keys())
+            compiled = self._get_compiled_schema()
+            needs = compiled.keys if compiled is not None else ()
             res = {}
             for key in needs:
-                if file_param.get(key) is not None:
-                    res[key] = file_param.get(key)
+                value = file_param.get(key)
+                if value is not None:
+                    res[key] = value
             return res
         return file_param
 
+    def _filter_config_file(self, file_param: Dict[str, Any]) -> Dict[str, Any]:
+        """调用`file_config_filter`筛选配置文件中的参数.
+
+        缓存的解析结果是只读的,覆写了`file_config_filter`的子类可能会修改传入的字典,此时传入可写的副本.
+        """
+        if type(self).file_config_filter is not EntryPoint.file_config_filter and isinstance(file_param, FrozenDict):
+            file_param = thaw(file_param)
+        return self.file_config_filter(file_param)
+
     def parse_json_configfile_args(self, p: Path) -> Dict[str, Any]:
         with open(p, "r", encoding="utf-8") as f:
             result = json.load(f)
@@ -373,6 +772,27 @@ class EntryPoint(EntryPointABC):
             result = yaml.load(f, Loader=yaml.CLoader)
         return result
 
+    def read_config_file(self, p: Path, parser: Callable[[Path], Dict[str, Any]]) -> Dict[str, Any]:
+        """使用解析函数读取配置文件.
+
+        `cache_config_file`为`True`时解析结果会按文件指纹缓存在进程内,文件没有变化时直接返回缓存的只读结果.
+        `persistent_config_cache`为`True`时json以外格式的解析结果还会持久化缓存在缓存目录中,供之后启动的进程使用.
+
+        Args:
+            p (Path): 配置文件路径
+            parser (Callable[[Path], Dict[str, Any]]): 解析函数
+
+        Returns:
+            Dict[str, Any]: 配置文件中的配置
+        """
+        loader = parser
+        # json本身解析很快,不使用持久化缓存
+        if self.persistent_config_cache and getattr(parser, "__func__", None) is not EntryPoint.parse_json_configfile_args:
+            loader = functools.partial(persistent_cache.load, parser=parser)
+        if self.cache_config_file:
+            return config_file_cache.load(p, parser, loader)
+        return loader(p)
+
     def regist_config_file_parser(self, file_name: str) -> Callable[[Callable[[Path], Dict[str, Any]]], Callable[[Path], Dict[str, Any]]]:
         def decorate(func: Callable[[Path], Dict[str, Any]]) -> Callable[[Path], Dict[str, Any]]:
             @functools.wraps(func)
@@ -382,49 +802,137 @@ class EntryPoint(EntryPointABC):
             return wrap
         return decorate
 
+    def _get_config_file_parser(self, p: Path, *, selective: bool = False) -> Optional[Callable[[Path], Dict[str, Any]]]:
+        """根据文件后缀在格式注册表中获取配置文件的解析函数,不支持的格式返回None.
+
+        json和yaml格式使用节点的`parse_json_configfile_args`和`parse_yaml_configfile_args`方法解析,
+        `selective`为`True`且没有覆写`parse_yaml_configfile_args`时,yaml使用只提取schema中字段的解析函数,不需要的顶层字段在解析时就被跳过.
+        `config.json.gz`这样带压缩后缀的文件解压后直接由格式注册表中的读取函数解析,不经过节点的解析方法.
+        """
+        suffix, compression = split_compression_suffix(p)
+        codec = get_config_codec(suffix)
+        if codec is None:
+            return None
+        parfunc: Callable[[Path], Dict[str, Any]]
+        if codec.name == "json":
+            parfunc = self.parse_json_configfile_args
+        elif codec.name == "yaml":
+            parfunc = self.parse_yaml_configfile_args
+            if selective and (compression is not None or getattr(parfunc, "__func__", None) is EntryPoint.parse_yaml_configfile_args):
+                compiled = self._get_compiled_schema()
+                if compiled is not None and self.schema is not None and self.schema.get("properties") is not None:
+                    return SelectiveParser(compiled.keys, compression)
+        else:
+            return codec if compression is None else CompressedCodec(codec, compression)
+        if compression is not None:
+            return CompressedCodec(codec, compression)
+        return parfunc
+
+    def _get_default_config_file_parser(self, p: Path) -> Optional[Callable[[Path], Dict[str, Any]]]:
+        """获取默认配置文件的解析函数,优先使用按文件名注册的解析函数,不支持的格式返回None."""
+        parfunc = self._config_file_parser_map.get(p.name)
+        if parfunc:
+            return parfunc
+        return self._get_config_file_parser(p, selective=self.config_file_only_get_need)
+
+    def _timed_read_config_file(self, job: Tuple[Path, Callable[[Path], Dict[str, Any]]]) -> Tuple[Dict[str, Any], float]:
+        p, parfunc = job
+        start = perf_counter()
+        result = self.read_config_file(p, parfunc)
+        return result, perf_counter() - start
+
+    def _read_config_files(self, jobs: List[Tuple[Path, Callable[[Path], Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """读取一组配置文件并记录每个文件的耗时,结果按传入的顺序排列.
+
+        `concurrent_config_file`为`True`且有多个文件时在线程池中并发读取和解析.
+        """
+        if self.concurrent_config_file and len(jobs) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(jobs), 8), thread_name_prefix="schema_entry_config") as pool:
+                outputs = list(pool.map(self._timed_read_config_file, jobs))
+        else:
+            outputs = [self._timed_read_config_file(job) for job in jobs]
+        self._config_file_timings = {str(p): cost for (p, _), (_, cost) in zip(jobs, outputs)}
+        return [result for result, _ in outputs]
+
+    def _load_binary_fields(self, file_param: Dict[str, Any], p: Path) -> Dict[str, Any]:
+        """将配置文件中数值数组字段的`{"$binary": path}`引用替换为内存映射的数组.
+
+        读取失败时保留原来的引用,由schema校验报错.
+
+        Args:
+            file_param (Dict[str, Any]): 配置文件中的配置
+            p (Path): 配置文件路径,相对路径的引用相对于它所在的目录
+
+        Returns:
+            Dict[str, Any]: 替换后的配置
+        """
+        compiled = self._get_compiled_schema()
+        if compiled is None or not compiled.binary_keys:
+            return file_param
+        result = None
+        for key in compiled.binary_keys:
+            value = file_param.get(key)
+            if is_binary_ref(value):
+                try:
+                    array = resolve_binary_ref(value, p.parent)
+                except (OSError, ValueError) as e:
+                    warnings.warn(f"读取字段{key}的二进制文件失败: {e}")
+                    continue
+                if result is None:
+                    result = dict(file_param)
+                result[key] = array
+        return file_param if result is None else result
+
     def parse_configfile_args(self) -> Dict[str, Any]:
+        self._config_file_timings = {}
         if not self.default_config_file_paths:
             return {}
         if not self.load_all_config_file:
-            for p_str in self.default_config_file_paths:
-                p = Path(p_str)
-                if p.is_file():
-                    parfunc = self._config_file_parser_map.get(p.name)
-                    if parfunc:
-                        return self.file_config_filter(parfunc(p))
-                    if p.suffix == ".json":
-                        return self.file_config_filter(self.parse_json_configfile_args(p))
-                    elif p.suffix == ".yml":
-                        return self.file_config_filter(self.parse_yaml_configfile_args(p))
-                    else:
-                        warnings.warn(f"跳过不支持的配置格式的文件{str(p)}")
+            for p in find_config_files(self.default_config_file_paths, cached=self.cache_config_file_lookup):
+                parfunc = self._get_default_config_file_parser(p)
+                if parfunc:
+                    return self._load_binary_fields(self._filter_config_file(self._read_config_files([(p, parfunc)])[0]), p)
+                else:
+                    warnings.warn(f"跳过不支持的配置格式的文件{str(p)}")
             else:
                 warnings.warn("配置文件的指定路径都不可用.")
                 return {}
         else:
+            jobs = []
+            for p in find_config_files(self.default_config_file_paths, cached=self.cache_config_file_lookup):
+                parfunc = self._get_default_config_file_parser(p)
+                if parfunc:
+                    jobs.append((p, parfunc))
+                else:
+                    warnings.warn(f"跳过不支持的配置格式的文件{str(p)}")
             result = {}
-            for p_str in self.default_config_file_paths:
-                p = Path(p_str)
-                if p.is_file():
-                    parfunc = self._config_file_parser_map.get(p.name)
-                    if parfunc:
-                        result.update(self.file_config_filter(parfunc(p)))
-                    else:
-                        if p.suffix == ".json":
-                            result.update(self.file_config_filter(
-                                self.parse_json_configfile_args(p)))
-                        elif p.suffix == ".yml":
-                            result.update(self.file_config_filter(
-                                self.parse_yaml_configfile_args(p)))
-                        else:
-                            warnings.warn(f"跳过不支持的配置格式的文件{str(p)}")
+            # 按声明的顺序合并,后面的文件覆盖前面的文件
+            for (p, _), file_param in zip(jobs, self._read_config_files(jobs)):
+                result.update(self._load_binary_fields(self._filter_config_file(file_param), p))
             return result
 
     def validat_config(self) -> bool:
+        return self._validate_config(self.config)
+
+    def _validate_config(self, config: Dict[str, Any]) -> bool:
         if self.verify_schema:
-            if self.schema and self.config:
+            if self.schema and config:
                 try:
-                    validate(instance=self.config, schema=self.schema)
+                    compiled = self._get_compiled_schema()
+                    binary_keys: List[str] = []
+                    if compiled is not None and compiled.binary_keys:
+                        # 内存映射的数组只检查元素类型,其余字段照常校验
+                        binary_keys = [key for key in compiled.binary_keys if isinstance(config.get(key), memoryview)]
+                        for key in binary_keys:
+                            error = check_binary_array(key, config[key], compiled.properties[key])
+                            if error is not None:
+                                raise ValueError(error)
+                    if binary_keys:
+                        cached_validate(config, without_binary_properties(cast(Dict[str, Any], self.schema), binary_keys))
+                    else:
+                        validator = self._get_validator()
+                        if validator is not None:
+                            validator.validate(config)
                 except Exception as e:
                     warnings.warn(str(e))
                     return False
@@ -436,20 +944,107 @@ class EntryPoint(EntryPointABC):
         else:
             return True
 
+    def _stat_config_files(self) -> Dict[str, Optional[FileKey]]:
+        """获取默认配置文件和命令行指定的配置文件的文件指纹,文件不存在时为None."""
+        paths = list(self.default_config_file_paths)
+        if self._cmd_config_path is not None:
+            paths.append(str(self._cmd_config_path))
+        stats: Dict[str, Optional[FileKey]] = {}
+        for path in paths:
+            try:
+                stats[path] = file_key(Path(path))
+            except OSError:
+                stats[path] = None
+        return stats
+
+    def poll_config_files(self) -> bool:
+        """检查一次配置文件是否变化,有变化时重新加载配置.
+
+        只重新读取变化的来源层(默认配置文件或命令行指定的配置文件),其他层保持不变.
+        合并后的配置通过校验才会替换当前配置并调用`on_config_reload`注册的函数,读取或校验失败时保留原来的配置.
+
+        Returns:
+            bool: 是否加载了新的配置
+        """
+        with self._watch_lock:
+            layers = self._config_layers
+            if layers is None:
+                return False
+            stats = self._stat_config_files()
+            old_stats = self._watch_stats
+            self._watch_stats = stats
+            if old_stats is None:
+                return False
+            changed = {path for path, key in stats.items() if old_stats.get(path) != key}
+            if not changed:
+                return False
+            new_layers = LayeredConfig([(name, layers.layer(name)) for name in layers.layer_names])
+            try:
+                if changed & set(self.default_config_file_paths):
+                    for path in changed:
+                        invalidate_config_file_lookup(os.path.dirname(os.path.abspath(path)))
+                    new_layers.set_layer("config_file", self.parse_configfile_args())
+                if self._cmd_config_path is not None and str(self._cmd_config_path) in changed:
+                    new_layers.set_layer("cmd_config_file", self._read_cmd_config_file(self._cmd_config_path))
+            except Exception as e:
+                warnings.warn(f"重新读取配置文件失败,保留原来的配置: {e}")
+                return False
+            config = new_layers.resolved()
+            if not self._validate_config(config):
+                warnings.warn("新的配置没有通过校验,保留原来的配置")
+                return False
+            self._config_layers = new_layers
+            self._config = config
+            self._config_view = config
+            callback = self._reload_callback
+        if callback is not None:
+            try:
+                callback(**self._config_for_main(config))
+            except Exception as e:
+                warnings.warn(f"配置重新加载的回调函数执行失败: {e}")
+        return True
+
+    def _watch_config_files(self, stop: threading.Event) -> None:
+        while not stop.wait(self.watch_interval):
+            self.poll_config_files()
+
+    def start_watch(self) -> None:
+        """启动后台线程按`watch_interval`轮询配置文件的变化."""
+        if self._watch_stop is not None:
+            return
+        with self._watch_lock:
+            self._watch_stats = self._stat_config_files()
+        stop = self._watch_stop = threading.Event()
+        thread = threading.Thread(target=self._watch_config_files, args=(stop,), name="schema_entry_watch", daemon=True)
+        thread.start()
+
+    def stop_watch(self) -> None:
+        """停止轮询配置文件."""
+        stop = self._watch_stop
+        if stop is not None:
+            stop.set()
+            self._watch_stop = None
+
+    def _config_for_main(self, config: Mapping[str, Any]) -> Mapping[str, Any]:
+        """获取传给执行函数的配置.
+
+        默认是可写的副本,修改它不会影响节点的`config`;`pass_frozen_config`为`True`时直接传只读视图,省去每次执行时对整个配置的深拷贝.
+        """
+        if self.pass_frozen_config:
+            return freeze(config)
+        return thaw(config)
+
     def do_main(self) -> Optional[Any]:
         if self._main is None:
             warnings.warn("未注册启动函数,返回config值")
             return self.config
         else:
-            config = self.config
-            return self._main(**config)
+            return self._main(**self._config_for_main(self.config))
 
     def parse_default(self) -> Dict[str, Any]:
-        if self.schema:
-            prop = self.schema.get("properties")
-            if prop:
-                return {key: sch.get("default") for key, sch in prop.items() if sch.get("default")}
-            return {}
+        compiled = self._get_compiled_schema()
+        if compiled is not None:
+            return dict(compiled.defaults)
         return {}
 
     def parse_args(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Optional[Any]:
@@ -463,22 +1058,48 @@ class EntryPoint(EntryPointABC):
             parser (argparse.ArgumentParser): 命令行参数解析器
             argv (Sequence[str]): 命令行参数序列
         """
+        argv, snapshot_path, dump_path = self._split_snapshot_args(argv)
+        fingerprint = None
+        if snapshot_path is not None or dump_path is not None:
+            fingerprint = self._snapshot_fingerprint(argv)
+        if snapshot_path is not None and fingerprint is not None:
+            snapshot = load_snapshot(snapshot_path, fingerprint)
+            if snapshot is not None:
+                # 快照中是已经校验过的最终配置
+                layers = LayeredConfig([("snapshot", snapshot)])
+                self._config_layers = layers
+                self._config = layers.resolved()
+                self._config_view = None
+                return self.do_main()
+        layers = LayeredConfig()
         # 默认配置
-        default_config = self.parse_default()
-        self._config.update(default_config)
+        layers.set_layer("default", self.parse_default())
         # 默认配置文件配置
-        file_config = self.parse_configfile_args()
-        self._config.update(file_config)
+        layers.set_layer("config_file", self.parse_configfile_args())
         # 命令行指定配置文件配置
         cmd_config_file_config, cmd_config = self.parse_commandline_args(
             parser, argv)
-        self._config.update(cmd_config_file_config)
+        layers.set_layer("cmd_config_file", cmd_config_file_config)
         # 环境变量配置
-        env_config = self.parse_env_args()
-        self._config.update(env_config)
+        layers.set_layer("env", self.parse_env_args())
         # 命令行指定配置
-        self._config.update(cmd_config)
+        layers.set_layer("cmdline", cmd_config)
+        self._config_layers = layers
+        self._config = layers.resolved()
+        self._config_view = None
         if self.validat_config():
+            if dump_path is not None and fingerprint is not None:
+                try:
+                    if not dump_snapshot(dump_path, fingerprint, self._config):
+                        warnings.warn("配置中有无法写入快照的值,跳过写入快照")
+                except OSError as e:
+                    warnings.warn(f"写入快照{dump_path}失败: {e}")
+            if self.watch_config_file:
+                self.start_watch()
+                try:
+                    return self.do_main()
+                finally:
+                    self.stop_watch()
             return self.do_main()
         else:
             sys.exit(1)
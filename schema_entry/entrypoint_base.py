@@ -2,9 +2,13 @@
 import abc
 import argparse
 from pathlib import Path
-from typing import Callable, Sequence, Dict, Any, Optional, Tuple, List, Union, Protocol, Literal
+from typing import Callable, Sequence, Dict, Mapping, Any, Optional, Tuple, List, Union, Protocol, Literal, TYPE_CHECKING, overload
 from mypy_extensions import TypedDict
 
+from .layered import LayeredConfig
+if TYPE_CHECKING:
+    from .lazy import LazySubcmd
+
 JsonSchemaMode = Literal['validation', 'serialization']
 
 
@@ -50,13 +54,23 @@ class EntryPointABC(abc.ABC):
         parent (Optional["EntryPointABC"]): 入口节点的父节点.Default None
         schema (Optional[Dict[str, Any]]): 入口节点的设置需要满足的json schema对应字典.Default None
         verify_schema (bool): 获得设置后节点是否校验设置是否满足定义的json schema模式
+        lazy_check_schema (bool): 是否推迟到节点第一次解析参数时才检查schema是否受支持
         default_config_file_paths (Sequence[str]): 设置默认的配置文件位置.
         config_file_only_get_need (bool): 设置是否只从配置文件中获取schema中定义的配置项
         load_all_config_file (bool): 设置的默认配置文件全部加载.
+        concurrent_config_file (bool): 加载全部配置文件时是否在线程池中并发读取和解析,合并仍按声明的顺序进行
+        cache_config_file (bool): 是否在进程内按文件指纹缓存配置文件的解析结果
+        cache_config_file_lookup (bool): 查找默认配置文件时是否使用进程内缓存的目录列表
+        persistent_config_cache (bool): 是否在缓存目录中持久化缓存yaml和自定义格式配置文件的解析结果
+        config_snapshot (bool): 叶子节点是否支持`--dump-resolved-config`和`--from-snapshot`配置快照参数
+        watch_config_file (bool): 执行函数运行期间是否轮询配置文件的变化并重新加载配置
+        watch_interval (float): 轮询配置文件的间隔秒数
+        pass_frozen_config (bool): 执行函数和重新加载的回调函数是否直接收到只读的配置,为False时收到可写的副本
         env_prefix (str): 设置环境变量的前缀
         parse_env (bool): 展示是否解析环境变量
         argparse_check_required  (bool): 命令行参数是否解析必填项为必填项
         argparse_noflag (Optional[str]): 命令行参数解析哪个字段为无`--`的参数
+        argparse_fast (bool): 叶子节点是否优先使用根据schema构造的参数表快速解析命令行,无法快速解析时仍使用argparse
 
     """
     epilog: str
@@ -67,19 +81,32 @@ class EntryPointABC(abc.ABC):
     # Optional[Dict[str, Union[str, List[str], Dict[str, Dict[str, Any]]]]]
     schema: Optional[SchemaType]
     verify_schema: bool
+    lazy_check_schema: bool
 
     default_config_file_paths: Sequence[str]
     config_file_only_get_need: bool
     load_all_config_file: bool
+    concurrent_config_file: bool
+    cache_config_file: bool
+    cache_config_file_lookup: bool
+    persistent_config_cache: bool
+    config_snapshot: bool
+    watch_config_file: bool
+    watch_interval: float
+    pass_frozen_config: bool
     env_prefix: Optional[str]
     parse_env: bool
     argparse_check_required: bool
     argparse_noflag: Optional[str]
+    argparse_fast: bool
 
-    _subcmds: Dict[str, "EntryPointABC"]
+    _schema_checked: bool
+    _prog: Optional[str]
+    _subcmds: Dict[str, Union["EntryPointABC", "LazySubcmd"]]
     _main: Optional[Callable[..., Optional[Any]]]
     _config_file_parser_map: Dict[str, Callable[[Path], Dict[str, Any]]]
     _config: Dict[str, Any]
+    _config_layers: Optional[LayeredConfig]
 
     @property
     @abc.abstractmethod
@@ -102,6 +129,36 @@ class EntryPointABC(abc.ABC):
         配置为只读数据.
         """
 
+    @property
+    def config_layers(self) -> Optional[LayeredConfig]:
+        """分层保存的配置.
+
+        节点解析参数后,各个来源的配置按优先级从低到高分别保存在
+        `default`,`config_file`,`cmd_config_file`,`env`,`cmdline`这几层中.
+        节点还没有解析过参数或不支持分层时为None.
+        """
+        return None
+
+    @property
+    def config_file_timings(self) -> Dict[str, float]:
+        """最近一次加载默认配置文件时每个文件读取和解析的耗时(秒),按声明的顺序排列.不记录耗时的节点为空字典."""
+        return {}
+
+    def config_source(self, key: str) -> Optional[str]:
+        """获取配置项最终生效值的来源层.
+
+        Args:
+            key (str): 配置项名
+
+        Returns:
+            Optional[str]: 来源层的层名,配置项不存在或节点还没有解析过参数时返回None
+
+        """
+        layers = self.config_layers
+        if layers is None:
+            return None
+        return layers.source_of(key)
+
     @abc.abstractmethod
     def regist_subcmd(self, subcmd: "EntryPointABC") -> None:
         """注册子命令.
@@ -110,18 +167,39 @@ class EntryPointABC(abc.ABC):
             subcmd (EntryPointABC): 子命令的实例
 
         """
-    @abc.abstractmethod
+    @overload
     def regist_sub(self, subcmdclz: type, **kwargs: Any) -> "EntryPointABC":
+        ...
+
+    @overload
+    def regist_sub(self, subcmdclz: str, *, name: str, description: Optional[str] = None, **kwargs: Any) -> "LazySubcmd":
+        ...
+
+    @abc.abstractmethod
+    def regist_sub(self, subcmdclz: Union[type, str], **kwargs: Any) -> Union["EntryPointABC", "LazySubcmd"]:
         '''注册子命令.
 
+        子命令也可以使用`pkg.module:ClassName`形式的导入路径注册,此时必须提供`name`,可以提供一行描述`description`,
+        模块只会在命令分发到该子命令时才导入并实例化,其他关键字参数会在实例化时传给子命令类.
+
         Args:
-            subcmdclz (EntryPointABC): 子命令的定义类
+            subcmdclz (Union[type, str]): 子命令的定义类或它的导入路径
 
         Returns:
-            [EntryPointABC]: 注册类的实例
+            [Union[EntryPointABC, LazySubcmd]]: 注册类的实例,使用导入路径注册时为延迟加载的占位
 
         '''
 
+    def check_tree(self) -> None:
+        """检查以本节点为根的整棵树中各节点的schema是否受支持.
+
+        用于在`lazy_check_schema`为True时一次性提前完成全部检查,比如在CI中.默认不做检查.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: 有节点的schema不满足`SUPPORT_SCHEMA`
+
+        """
+
     @abc.abstractmethod
     def regist_config_file_parser(self, file_name: str) -> Callable[[Callable[[Path], Dict[str, Any]]], Callable[[Path], Dict[str, Any]]]:
         '''注册特定配置文件名的解析方式.
@@ -145,6 +223,26 @@ class EntryPointABC(abc.ABC):
 
         """
 
+    def on_config_reload(self, func: Callable[..., Optional[Any]]) -> Callable[..., Optional[Any]]:
+        """注册函数在配置文件变化并重新加载的配置通过校验后执行.
+
+        函数以与执行函数相同的方式接收新的配置,在轮询线程中执行.不支持热加载的节点不会调用它.
+
+        Args:
+            func (Callable[..., Optional[Any]]): 待执行的函数.
+
+        """
+        return func
+
+    def poll_config_files(self) -> bool:
+        """检查一次配置文件是否变化,有变化时重新加载配置.
+
+        Returns:
+            bool: 是否加载了新的配置,不支持热加载的节点总是返回False
+
+        """
+        return False
+
     @abc.abstractmethod
     def with_schema(self, schemaObj: Union[str, dict, PydanticModelLike]) -> Union[str, dict, PydanticModelLike]:
         """注册schema
@@ -153,7 +251,7 @@ class EntryPointABC(abc.ABC):
         """
 
     @abc.abstractmethod
-    def __call__(self, argv: Sequence[str]) -> Optional[CallerReturnType]:
+    def __call__(self, argv: Sequence[str], *, env: Optional[Mapping[str, str]] = None) -> Optional[CallerReturnType]:
         """执行命令.
 
         如果当前的命令节点不是终点(也就是下面还有子命令)则传递参数到下一级;
@@ -162,6 +260,7 @@ class EntryPointABC(abc.ABC):
 
         Args:
             argv (Sequence[str]): [description]
+            env (Optional[Mapping[str, str]], optional): 代替`os.environ`使用的环境变量,会继续传给子节点. Defaults to None.
 
         """
     @abc.abstractmethod
@@ -195,6 +294,19 @@ class EntryPointABC(abc.ABC):
 
         """
 
+    def read_config_file(self, p: Path, parser: Callable[[Path], Dict[str, Any]]) -> Dict[str, Any]:
+        """使用解析函数读取配置文件,默认直接调用解析函数.
+
+        Args:
+            p (Path): 配置文件路径
+            parser (Callable[[Path], Dict[str, Any]]): 解析函数
+
+        Returns:
+            Dict[str, Any]: 配置文件中的配置
+
+        """
+        return parser(p)
+
     @abc.abstractmethod
     def parse_configfile_args(self) -> Dict[str, Any]:
         """从指定的配置文件队列中构造配置参数.
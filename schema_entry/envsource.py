@@ -0,0 +1,55 @@
+"""envsource.
+
+环境变量的快照.
+
+节点从环境变量读取配置时,所有变量名都形如`{前缀}_{字段名}`.
+`EnvSource`对`os.environ`或传入的映射做一次快照,按前缀建立索引,
+节点只需要遍历带有自己前缀的少量变量,而不必为schema中的每个字段分别查询环境变量.
+同时也可以在调用节点时传入独立的环境变量,而不需要修改进程的环境变量.
+"""
+import os
+from typing import Dict, Mapping, Optional
+
+
+class EnvSource:
+    """环境变量快照.
+
+    快照在第一次使用时才会生成,每个前缀的索引只会建立一次.
+
+    Args:
+        environ (Optional[Mapping[str, str]]): 使用的环境变量,为None时使用`os.environ`的快照.
+
+    """
+
+    def __init__(self, environ: Optional[Mapping[str, str]] = None) -> None:
+        self._environ = environ
+        self._snapshot: Optional[Dict[str, str]] = None
+        self._prefix_index: Dict[str, Dict[str, str]] = {}
+
+    @property
+    def snapshot(self) -> Dict[str, str]:
+        """环境变量的快照."""
+        if self._snapshot is None:
+            self._snapshot = dict(os.environ if self._environ is None else self._environ)
+        return self._snapshot
+
+    def with_prefix(self, prefix: str) -> Dict[str, str]:
+        """获取以`{prefix}_`开头且值不为空的环境变量.
+
+        Args:
+            prefix (str): 变量名前缀,不含结尾的`_`.
+
+        Returns:
+            Dict[str, str]: 变量名到值的映射
+
+        """
+        index = self._prefix_index.get(prefix)
+        if index is None:
+            head = f"{prefix}_"
+            index = {key: value for key, value in self.snapshot.items() if value and key.startswith(head)}
+            self._prefix_index[prefix] = index
+        return index
+
+    def get(self, key: str) -> Optional[str]:
+        """获取环境变量的值,不存在时返回None."""
+        return self.snapshot.get(key)
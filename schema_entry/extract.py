@@ -0,0 +1,167 @@
+"""extract.
+
+只提取yaml配置文件中需要的顶层字段.
+
+共享的配置文件中往往有很多节点不需要的部分,`config_file_only_get_need`为`True`时这些部分在解析后也会被丢弃.
+yaml的构造代价远高于解析,这个模块逐个读取解析事件,不需要的值的事件直接丢弃,需要的值由事件组合成节点后再构造.
+
+json不使用这种方式:`json`的C解码器整体解码已经很快,逐个顶层字段解码反而更慢,因此json配置文件仍完整解析后再筛选.
+
+遇到无法确定结果与完整解析一致的情况(顶层不是对象,出现合并键或引用了被跳过部分的别名,多个文档等)时返回None,
+由调用方退回完整解析.
+"""
+from pathlib import Path
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, Iterable, Iterator, Optional
+import yaml
+from yaml.events import (
+    Event, ScalarEvent, StreamStartEvent, StreamEndEvent, DocumentStartEvent, DocumentEndEvent,
+    MappingStartEvent, MappingEndEvent, SequenceStartEvent, SequenceEndEvent
+)
+from yaml.nodes import ScalarNode
+
+from .compression import open_config_stream
+
+
+class _EventLoader(yaml.composer.Composer, yaml.constructor.Constructor, yaml.resolver.Resolver):
+    """从事件序列构造yaml数据的加载器,使用与`yaml.CLoader`相同的构造器和解析器."""
+
+    def __init__(self) -> None:
+        yaml.composer.Composer.__init__(self)
+        yaml.constructor.Constructor.__init__(self)
+        yaml.resolver.Resolver.__init__(self)
+        self.events: Deque[Event] = deque()
+
+    def check_event(self, *choices: Any) -> bool:
+        if not self.events:
+            return False
+        return not choices or isinstance(self.events[0], choices)
+
+    def peek_event(self) -> Event:
+        return self.events[0]
+
+    def get_event(self) -> Event:
+        return self.events.popleft()
+
+    def is_str_key(self, event: ScalarEvent) -> bool:
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = self.resolve(ScalarNode, event.value, event.implicit)
+        return tag == "tag:yaml.org,2002:str"
+
+    def construct_events(self, events: Iterable[Event]) -> Any:
+        self.events.extend(events)
+        try:
+            node = self.compose_node(None, None)
+        except yaml.composer.ComposerError as e:
+            # 引用了被跳过部分中的锚点
+            raise _Fallback(str(e)) from e
+        return self.construct_document(node)
+
+
+class _Fallback(Exception):
+    """yaml文档超出了可以逐事件提取的范围."""
+
+
+def _read_value_events(events: Iterator[Event]) -> Iterator[Event]:
+    """从事件流中读取一个完整的值的事件."""
+    depth = 0
+    for event in events:
+        yield event
+        if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+    raise _Fallback("unexpected end of stream")
+
+
+def _expect(events: Iterator[Event], event_type: type) -> Event:
+    event = next(events, None)
+    if not isinstance(event, event_type):
+        raise _Fallback(f"expected {event_type.__name__}")
+    return event
+
+
+def extract_yaml_keys(stream: Any, keys: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+    """从yaml流中提取指定的顶层字段.
+
+    Args:
+        stream (Any): yaml文本或打开的文件.
+        keys (FrozenSet[str]): 需要的顶层字段.
+
+    Returns:
+        Optional[Dict[str, Any]]: 需要的字段组成的字典,无法确定结果与完整解析一致时返回None
+
+    """
+    loader = _EventLoader()
+    result: Dict[str, Any] = {}
+    events = yaml.parse(stream, Loader=yaml.CLoader)
+    try:
+        _expect(events, StreamStartEvent)
+        _expect(events, DocumentStartEvent)
+        start = _expect(events, MappingStartEvent)
+        if start.anchor is not None or start.tag not in (None, "!", "tag:yaml.org,2002:map"):
+            return None
+        while True:
+            event = next(events, None)
+            if isinstance(event, MappingEndEvent):
+                break
+            if not isinstance(event, ScalarEvent) or event.anchor is not None:
+                # 复杂键,别名键和带锚点的键交给完整解析处理
+                return None
+            if loader.is_str_key(event) and event.value in keys:
+                result[event.value] = loader.construct_events(_read_value_events(events))
+            elif event.value == "<<" and event.tag is None:
+                # 合并键
+                return None
+            else:
+                for _ in _read_value_events(events):
+                    pass
+        _expect(events, DocumentEndEvent)
+        _expect(events, StreamEndEvent)
+    except _Fallback:
+        return None
+    return result
+
+
+def load_yaml_keys(p: Path, keys: FrozenSet[str], compression: Optional[str] = None) -> Dict[str, Any]:
+    """读取yaml配置文件中指定的顶层字段,无法提取时返回完整的解析结果."""
+    with open_config_stream(p, compression) as f:
+        result = extract_yaml_keys(f, keys)
+    if result is None:
+        with open_config_stream(p, compression) as f:
+            return yaml.load(f, Loader=yaml.CLoader)
+    return result
+
+
+class SelectiveParser:
+    """只读取指定顶层字段的yaml配置文件解析函数.
+
+    解析函数以字段集合和压缩格式判断相等,可以作为配置文件缓存的键,`cache_name`是持久化缓存使用的跨进程稳定的名字.
+
+    Args:
+        keys (Iterable[str]): 需要的顶层字段.
+        compression (Optional[str]): 压缩后缀,例如`.gz`,为None时文件没有压缩. Defaults to None.
+
+    """
+
+    def __init__(self, keys: Iterable[str], compression: Optional[str] = None) -> None:
+        self.keys = frozenset(keys)
+        self.compression = compression
+        self.cache_name = f"{type(self).__name__}.yaml{compression or ''}[{','.join(sorted(self.keys))}]"
+
+    def __call__(self, p: Path) -> Dict[str, Any]:
+        return load_yaml_keys(p, self.keys, self.compression)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SelectiveParser) and (self.keys, self.compression) == (other.keys, other.compression)
+
+    def __hash__(self) -> int:
+        return hash((SelectiveParser, self.keys, self.compression))
+
+    def __repr__(self) -> str:
+        if self.compression is None:
+            return f"SelectiveParser({sorted(self.keys)!r})"
+        return f"SelectiveParser({sorted(self.keys)!r}, {self.compression!r})"
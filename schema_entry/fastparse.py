@@ -0,0 +1,200 @@
+"""fastparse.
+
+叶子节点命令行参数的快速解析.
+
+叶子节点根据schema构造的命令行参数只有很少的几种形式:
+`--key`和由`title`首字母构成的短参数,boolean型的`store_true`,array型的`append`,以及最多一个由`argparse_noflag`指定的位置参数.
+因此可以预先根据schema构造一张从参数名到(字段名,转换函数,行为)的表,对命令行参数做一次线性扫描即可完成解析.
+
+快速解析只处理能确定与`argparse`结果一致的输入,遇到`--help`,参数缩写,解析错误等情况时返回None,
+由调用方退回到`argparse`处理,这样帮助信息和错误提示都仍由`argparse`给出.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .entrypoint_base import SchemaType
+from .compiled_schema import compile_schema
+
+STORE = "store"
+STORE_TRUE = "store_true"
+APPEND = "append"
+
+
+class ArgvAction:
+    """一个命令行参数的解析行为.
+
+    Attributes:
+        dest (str): 解析结果中的字段名
+        action (str): 行为,`store`,`store_true`或`append`
+        convert (Optional[Callable[[str], Any]]): 值的转换函数,会同时检查可选值,`store_true`没有转换函数
+        default (Any): 默认值
+
+    """
+    __slots__ = ("dest", "action", "convert", "default")
+
+    def __init__(self, dest: str, action: str, convert: Optional[Callable[[str], Any]] = None, default: Any = None) -> None:
+        self.dest = dest
+        self.action = action
+        self.convert = convert
+        self.default = default
+
+    def to_value(self, raw: str) -> Any:
+        """转换参数值,转换失败或不在可选值中时抛出`ValueError`."""
+        if self.convert is None:
+            raise ValueError(raw)
+        try:
+            return self.convert(raw)
+        except (TypeError, ArithmeticError) as e:
+            raise ValueError(raw) from e
+
+
+class ArgvTable:
+    """由schema预先构造的命令行参数表.
+
+    Attributes:
+        flags (Dict[str, ArgvAction]): 参数名(例如`--a-a`,`-a`)到解析行为的映射
+        positional (Optional[ArgvAction]): 由`argparse_noflag`指定的位置参数
+        positional_many (bool): 位置参数是否可以接收多个值
+        requireds (List[str]): 必须出现的参数对应的字段名
+
+    """
+
+    def __init__(self) -> None:
+        self.flags: Dict[str, ArgvAction] = {}
+        self.actions: List[ArgvAction] = []
+        self.positional: Optional[ArgvAction] = None
+        self.positional_many = False
+        self.requireds: List[str] = []
+
+    def add(self, option_strings: Sequence[str], action: ArgvAction) -> bool:
+        for option_string in option_strings:
+            if option_string in self.flags:
+                return False
+            self.flags[option_string] = action
+        self.actions.append(action)
+        return True
+
+    def _consume(self, result: Dict[str, Any], action: ArgvAction, raw: str) -> None:
+        value = action.to_value(raw)
+        if action.action == APPEND:
+            items = result[action.dest]
+            result[action.dest] = (list(items) if items else []) + [value]
+        else:
+            result[action.dest] = value
+
+    def parse(self, argv: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """解析命令行参数.
+
+        Args:
+            argv (Sequence[str]): 命令行参数序列.
+
+        Returns:
+            Optional[Dict[str, Any]]: 与`vars(parser.parse_args(argv))`相同的结果,无法确定结果一致时返回None
+
+        """
+        result: Dict[str, Any] = {action.dest: action.default for action in self.actions}
+        seen = set()
+        positionals: List[str] = []
+        positional_end = -1
+        i = 0
+        n = len(argv)
+        try:
+            while i < n:
+                token = argv[i]
+                if len(token) < 2 or token[0] != "-":
+                    if positionals and positional_end != i:
+                        # 位置参数被可选参数隔开时argparse的行为比较复杂,交给argparse处理
+                        return None
+                    positionals.append(token)
+                    positional_end = i + 1
+                    i += 1
+                    continue
+                if token == "--":
+                    return None
+                action = self.flags.get(token)
+                explicit: Optional[str] = None
+                if action is None:
+                    if "=" in token:
+                        name, _, explicit = token.partition("=")
+                        action = self.flags.get(name)
+                    elif token[1] != "-":
+                        action = self.flags.get(token[:2])
+                        explicit = token[2:]
+                    if action is None:
+                        return None
+                seen.add(action.dest)
+                if action.action == STORE_TRUE:
+                    if explicit is not None:
+                        return None
+                    result[action.dest] = True
+                    i += 1
+                    continue
+                if explicit is None:
+                    if i + 1 >= n or argv[i + 1].startswith("-"):
+                        return None
+                    explicit = argv[i + 1]
+                    i += 1
+                self._consume(result, action, explicit)
+                i += 1
+            if self.positional is None:
+                if positionals:
+                    return None
+            else:
+                if not positionals or (len(positionals) > 1 and not self.positional_many):
+                    return None
+                if self.positional_many:
+                    result[self.positional.dest] = [self.positional.to_value(i) for i in positionals]
+                else:
+                    result[self.positional.dest] = self.positional.to_value(positionals[0])
+        except ValueError:
+            return None
+        if any(key not in seen for key in self.requireds):
+            return None
+        return result
+
+
+def build_argv_table(schema: Optional[SchemaType], *, noflag: Optional[str] = None,
+                     check_required: bool = False) -> Optional[ArgvTable]:
+    """根据schema构造命令行参数表.
+
+    构造规则与`utils.parse_schema_as_cmd`一致,另外包含`-c/--config`参数.
+
+    Args:
+        schema (Optional[SchemaType]): 节点的schema.
+        noflag (Optional[str], optional): 作为位置参数的字段. Defaults to None.
+        check_required (bool, optional): 是否将schema中的必填项作为命令行的必填项. Defaults to False.
+
+    Returns:
+        Optional[ArgvTable]: 参数表,无法保证与argparse结果一致时返回None
+
+    """
+    table = ArgvTable()
+    table.add(["-c", "--config"], ArgvAction("config", STORE, str))
+    if not schema:
+        return table
+    compiled = compile_schema(schema)
+    for key, prop in compiled.properties.items():
+        _type = prop.get("type")
+        if not _type:
+            continue
+        is_noflag = noflag == key
+        convert = compiled.converters[key].from_argv
+        if _type == "boolean":
+            if is_noflag:
+                return None
+            action = ArgvAction(key, STORE_TRUE, default=False)
+        elif convert is None:
+            continue
+        elif _type == "array":
+            action = ArgvAction(key, APPEND, convert, prop.get("default") or None)
+        else:
+            action = ArgvAction(key, STORE, convert)
+        if is_noflag:
+            table.positional = action
+            table.positional_many = action.action == APPEND
+            table.actions.append(action)
+            continue
+        if not table.add(compiled.option_strings[key], action):
+            return None
+        if check_required and key in compiled.required and _type != "boolean" and _type != "array":
+            table.requireds.append(key)
+    return table
@@ -0,0 +1,167 @@
+"""filecache.
+
+配置文件解析结果的进程内缓存.
+
+同一进程中的多个节点往往会读取相同的配置文件,而大的yaml文件解析代价很高.
+`ConfigFileCache`以`(真实路径, st_mtime_ns, st_size, st_ino, 解析函数)`为键缓存解析结果,
+文件被修改或替换后键随之变化,旧的结果不会再被命中.缓存按文件大小计算占用,超过预算时淘汰最久未使用的项.
+缓存的结果是只读结构,调用方如需修改应先`copy()`.
+"""
+import os
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional, Tuple
+
+from .frozen import freeze
+
+DEFAULT_MAXBYTES = 64 * 1024 * 1024
+
+FileKey = Tuple[str, int, int, int]
+
+
+class FileCacheInfo(NamedTuple):
+    """配置文件缓存的统计信息.
+
+    Attributes:
+        hits (int): 命中次数
+        misses (int): 未命中次数
+        bytes_saved (int): 命中时省去读取和解析的文件字节数
+        currbytes (int): 当前缓存的文件字节数
+        maxbytes (int): 缓存的字节预算
+        entries (int): 当前缓存的项数
+
+    """
+    hits: int
+    misses: int
+    bytes_saved: int
+    currbytes: int
+    maxbytes: int
+    entries: int
+
+
+def file_key(p: Path) -> FileKey:
+    """获取文件的指纹`(真实路径, st_mtime_ns, st_size, st_ino)`.
+
+    Args:
+        p (Path): 文件路径.
+
+    Returns:
+        FileKey: 文件指纹
+
+    """
+    realpath = os.path.realpath(p)
+    st = os.stat(realpath)
+    return (realpath, st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def parser_identity(parser: Callable[[Path], Any]) -> Hashable:
+    """获取解析函数的标识.
+
+    绑定方法使用其底层的函数作为标识,因此同一个类的不同节点实例可以共享缓存,
+    而覆写了解析方法的子类不会命中父类的缓存.
+    """
+    return getattr(parser, "__func__", parser)
+
+
+class ConfigFileCache:
+    """配置文件解析结果的LRU缓存.
+
+    Args:
+        maxbytes (int): 缓存的字节预算,按被缓存文件的大小计算,为0时不缓存. Defaults to DEFAULT_MAXBYTES.
+
+    """
+
+    def __init__(self, maxbytes: int = DEFAULT_MAXBYTES) -> None:
+        self._maxbytes = maxbytes
+        self._entries: "OrderedDict[Tuple[FileKey, Hashable], Any]" = OrderedDict()
+        self._currbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._lock = threading.Lock()
+
+    @property
+    def maxbytes(self) -> int:
+        return self._maxbytes
+
+    @maxbytes.setter
+    def maxbytes(self, value: int) -> None:
+        with self._lock:
+            self._maxbytes = value
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and self._currbytes > self._maxbytes:
+            (fkey, _), _ = self._entries.popitem(last=False)
+            self._currbytes -= fkey[2]
+
+    def load(self, p: Path, parser: Callable[[Path], Any], loader: Optional[Callable[[Path], Any]] = None) -> Any:
+        """读取并解析配置文件,文件未变化时直接返回缓存的结果.
+
+        Args:
+            p (Path): 配置文件路径.
+            parser (Callable[[Path], Any]): 解析函数.
+            loader (Optional[Callable[[Path], Any]], optional): 未命中时代替解析函数调用的读取函数,
+                例如经过持久化缓存的读取,缓存的键仍由`parser`决定. Defaults to None.
+
+        Returns:
+            Any: 只读的解析结果
+
+        """
+        fkey = file_key(p)
+        key = (fkey, parser_identity(parser))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                self._bytes_saved += fkey[2]
+                return self._entries[key]
+            self._misses += 1
+        result = freeze((loader or parser)(p))
+        size = fkey[2]
+        if size <= self._maxbytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = result
+                    self._currbytes += size
+                    self._evict()
+        return result
+
+    def info(self) -> FileCacheInfo:
+        """获取缓存的统计信息."""
+        with self._lock:
+            return FileCacheInfo(self._hits, self._misses, self._bytes_saved, self._currbytes, self._maxbytes, len(self._entries))
+
+    def clear(self) -> None:
+        """清空缓存和统计信息."""
+        with self._lock:
+            self._entries.clear()
+            self._currbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._bytes_saved = 0
+
+
+# 进程内共享的默认缓存
+config_file_cache = ConfigFileCache()
+
+
+def file_cache_info() -> FileCacheInfo:
+    """获取默认配置文件缓存的统计信息."""
+    return config_file_cache.info()
+
+
+def clear_file_cache() -> None:
+    """清空默认配置文件缓存."""
+    config_file_cache.clear()
+
+
+def set_file_cache_maxbytes(maxbytes: int) -> None:
+    """设置默认配置文件缓存的字节预算,超出预算的项会被立即淘汰.
+
+    Args:
+        maxbytes (int): 字节预算,为0时不缓存.
+
+    """
+    config_file_cache.maxbytes = maxbytes
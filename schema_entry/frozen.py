@@ -0,0 +1,147 @@
+"""frozen.
+
+只读的配置数据结构.
+
+`FrozenDict`和`FrozenList`分别是`dict`和`list`的子类,可以像普通字典和列表一样读取和比较,
+但所有修改操作都会抛出`TypeError`.已经冻结的结构再次冻结时会直接返回自身,
+因此多次合并得到的配置可以共享没有变化的部分而不需要复制.
+"""
+from typing import Any, Dict, List, NoReturn, Tuple
+
+
+def _readonly(*args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError("配置为只读数据,如需修改请使用`copy()`获取可写的副本")
+
+
+class FrozenDict(Dict[str, Any]):
+    """只读字典."""
+    __slots__ = ()
+
+    def __setitem__(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def __delitem__(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def __ior__(self, *args: Any, **kwargs: Any) -> NoReturn:  # type: ignore[misc]
+        _readonly()
+
+    def clear(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def pop(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def popitem(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def setdefault(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def update(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def copy(self) -> Dict[str, Any]:
+        """获取可写的深拷贝."""
+        return thaw(self)
+
+    def __copy__(self) -> Dict[str, Any]:
+        return thaw(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return thaw(self)
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, Any]]]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(List[Any]):
+    """只读列表."""
+    __slots__ = ()
+
+    def __setitem__(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def __delitem__(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def __iadd__(self, *args: Any, **kwargs: Any) -> NoReturn:  # type: ignore[misc]
+        _readonly()
+
+    def __imul__(self, *args: Any, **kwargs: Any) -> NoReturn:  # type: ignore[misc]
+        _readonly()
+
+    def append(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def extend(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def insert(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def pop(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def remove(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def clear(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def sort(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def reverse(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _readonly()
+
+    def copy(self) -> List[Any]:
+        """获取可写的深拷贝."""
+        return thaw(self)
+
+    def __copy__(self) -> List[Any]:
+        return thaw(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return thaw(self)
+
+    def __reduce__(self) -> Tuple[type, Tuple[List[Any]]]:
+        return (FrozenList, (list(self),))
+
+
+def freeze(obj: Any) -> Any:
+    """将数据递归转换为只读结构.
+
+    已经是只读结构的部分会被直接复用.
+
+    Args:
+        obj (Any): 待转换的数据.
+
+    Returns:
+        Any: 只读的数据
+
+    """
+    if isinstance(obj, (FrozenDict, FrozenList)):
+        return obj
+    if isinstance(obj, dict):
+        return FrozenDict((key, freeze(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return FrozenList(freeze(i) for i in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """将数据递归转换为可写的普通`dict`和`list`.
+
+    Args:
+        obj (Any): 待转换的数据.
+
+    Returns:
+        Any: 可写的数据副本
+
+    """
+    if isinstance(obj, dict):
+        return {key: thaw(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(i) for i in obj]
+    return obj
@@ -0,0 +1,110 @@
+"""layered.
+
+分层的配置存储.
+
+节点的配置来自多个来源(schema默认值,默认配置文件,命令行指定的配置文件,环境变量,命令行参数),
+`LayeredConfig`把每个来源保存为独立的一层,查找时从优先级最高的层开始逐层查找,
+不需要把各层合并复制成一个新的字典,同时可以知道每个配置项最终取自哪一层.
+"""
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .frozen import FrozenDict, freeze
+
+
+class LayeredConfig(Mapping[str, Any]):
+    """按优先级分层保存的只读配置.
+
+    后设置的层优先级更高,重新设置已有的层不会改变它的优先级.
+
+    Args:
+        layers (Optional[List[Tuple[str, Mapping[str, Any]]]]): 按优先级从低到高排列的(层名,配置)列表.
+
+    """
+
+    def __init__(self, layers: Optional[List[Tuple[str, Mapping[str, Any]]]] = None) -> None:
+        self._names: List[str] = []
+        self._layers: Dict[str, FrozenDict] = {}
+        self._resolved: Optional[FrozenDict] = None
+        for name, mapping in layers or []:
+            self.set_layer(name, mapping)
+
+    def set_layer(self, name: str, mapping: Mapping[str, Any]) -> None:
+        """设置一层配置.
+
+        Args:
+            name (str): 层名.
+            mapping (Mapping[str, Any]): 该层的配置,会被转换为只读结构保存.
+
+        """
+        if name not in self._layers:
+            self._names.append(name)
+        self._layers[name] = freeze(mapping if isinstance(mapping, dict) else dict(mapping))
+        self._resolved = None
+
+    def layer(self, name: str) -> FrozenDict:
+        """获取一层的配置,没有该层时返回空的只读字典."""
+        return self._layers.get(name, FrozenDict())
+
+    @property
+    def layer_names(self) -> List[str]:
+        """按优先级从低到高排列的层名."""
+        return list(self._names)
+
+    def source_of(self, key: str) -> Optional[str]:
+        """获取配置项最终生效值的来源层.
+
+        Args:
+            key (str): 配置项名.
+
+        Returns:
+            Optional[str]: 来源层的层名,没有任何一层包含该配置项时返回None
+
+        """
+        for name in reversed(self._names):
+            if key in self._layers[name]:
+                return name
+        return None
+
+    def sources(self) -> Dict[str, str]:
+        """获取全部配置项的来源层."""
+        result: Dict[str, str] = {}
+        for name in self._names:
+            for key in self._layers[name]:
+                result[key] = name
+        return result
+
+    def resolved(self) -> FrozenDict:
+        """获取合并后的只读配置.
+
+        结果会被缓存到下一次设置层为止,其中的值与各层共享而不会复制.
+        """
+        if self._resolved is None:
+            result: Dict[str, Any] = {}
+            for name in self._names:
+                result.update(self._layers[name])
+            self._resolved = FrozenDict(result)
+        return self._resolved
+
+    def __getitem__(self, key: str) -> Any:
+        for name in reversed(self._names):
+            layer = self._layers[name]
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers.values())
+
+    def __iter__(self) -> Iterator[str]:
+        seen: Dict[str, None] = {}
+        for name in self._names:
+            for key in self._layers[name]:
+                seen.setdefault(key, None)
+        return iter(seen)
+
+    def __len__(self) -> int:
+        return len(set().union(*self._layers.values()))
+
+    def __repr__(self) -> str:
+        layers = ", ".join(f"{name}={dict(self._layers[name])!r}" for name in self._names)
+        return f"LayeredConfig({layers})"
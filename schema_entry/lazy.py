@@ -0,0 +1,83 @@
+"""lazy.
+
+按导入路径延迟加载的子节点.
+
+使用`regist_sub("pkg.module:ClassName", name=..., description=...)`注册的子节点在注册时只保存导入路径,名字和描述,
+只有当命令分发真正到达它时才会导入模块并实例化节点,展示父节点的子命令列表时使用保存的描述而不需要导入.
+"""
+import importlib
+from typing import Any, Dict, Optional
+
+from .entrypoint_base import EntryPointABC
+
+
+def import_from_string(import_path: str) -> Any:
+    """根据`pkg.module:attr`形式的导入路径获取对象.
+
+    Args:
+        import_path (str): 导入路径,`:`前为模块路径,后为模块中的属性,属性可以用`.`访问嵌套的属性
+
+    Raises:
+        ValueError: 导入路径格式不正确
+        ImportError: 模块无法导入
+        AttributeError: 模块中没有指定的属性
+
+    Returns:
+        Any: 导入的对象
+
+    """
+    module_path, sep, attr_path = import_path.partition(":")
+    if not sep or not module_path or not attr_path:
+        raise ValueError(f"导入路径`{import_path}`的格式应为`pkg.module:ClassName`")
+    obj: Any = importlib.import_module(module_path)
+    for attr in attr_path.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class LazySubcmd:
+    """延迟加载的子节点占位.
+
+    Attributes:
+        import_path (str): 子节点类的导入路径
+        parent (Optional[EntryPointABC]): 父节点
+        instance (Optional[EntryPointABC]): 加载后的节点实例,未加载时为None
+
+    """
+
+    def __init__(self, import_path: str, name: str, description: Optional[str] = None, **kwargs: Any) -> None:
+        self.import_path = import_path
+        self._name = name
+        self.__doc__ = description
+        self._kwargs: Dict[str, Any] = kwargs
+        self.parent: Optional[EntryPointABC] = None
+        self.instance: Optional[EntryPointABC] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def load(self) -> EntryPointABC:
+        """导入并实例化子节点,然后在父节点中用实例替换占位.
+
+        Raises:
+            TypeError: 导入的对象不是`EntryPointABC`的子类
+
+        Returns:
+            EntryPointABC: 子节点实例
+
+        """
+        if self.instance is None:
+            subcmdclz = import_from_string(self.import_path)
+            if not (isinstance(subcmdclz, type) and issubclass(subcmdclz, EntryPointABC)):
+                raise TypeError(f"`{self.import_path}`不是EntryPoint的子类")
+            kwargs = dict(self._kwargs)
+            kwargs.setdefault("name", self._name)
+            instance = subcmdclz(**kwargs)
+            if self.parent is not None:
+                self.parent.regist_subcmd(instance)
+            self.instance = instance
+        return self.instance
+
+    def __repr__(self) -> str:
+        return f"LazySubcmd({self.import_path!r}, name={self._name!r})"
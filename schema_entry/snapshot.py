@@ -0,0 +1,86 @@
+"""snapshot.
+
+校验后的最终配置的快照.
+
+同一个叶子节点以相同的默认配置文件,环境变量和命令行参数反复启动时,每次都要重新读取配置文件,合并各层并校验schema.
+快照把校验通过的最终配置和这些输入的指纹一起用`marshal`保存,之后的启动只要指纹一致就可以直接使用快照中的配置.
+
+指纹由调用方给出的输入部件计算,部件中应包含schema,配置文件的`(真实路径, st_mtime_ns, st_size, st_ino)`,
+环境变量和命令行参数,任何一项变化都会使快照失效.`marshal`的格式与python版本有关,解释器版本也计入指纹.
+
++ 写入先写临时文件再用`os.replace`替换,并发启动的进程不会读到写了一半的快照
++ 配置中有`marshal`不支持的类型(例如yaml中的日期)时不写快照
+"""
+import sys
+import json
+import marshal
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+from .frozen import thaw
+from .utils import atomic_write_bytes
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_fingerprint(parts: Sequence[Any]) -> str:
+    """计算快照输入的指纹.
+
+    Args:
+        parts (Sequence[Any]): 可以序列化为json的输入部件.
+
+    Returns:
+        str: 指纹的十六进制摘要
+
+    """
+    text = json.dumps([sys.version_info[0], sys.version_info[1], marshal.version, SNAPSHOT_VERSION, list(parts)],
+                      sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def dump_snapshot(path: Union[str, Path], fingerprint: str, config: Dict[str, Any]) -> bool:
+    """写入配置快照.
+
+    Args:
+        path (Union[str, Path]): 快照文件路径.
+        fingerprint (str): 输入的指纹.
+        config (Dict[str, Any]): 校验后的最终配置.
+
+    Returns:
+        bool: 是否写入了快照,配置无法用`marshal`序列化或含有内存映射的数组时为False
+
+    """
+    if any(isinstance(value, memoryview) for value in config.values()):
+        # `marshal`会把内存映射的数组写成bytes
+        return False
+    try:
+        data = marshal.dumps({"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "config": thaw(config)})
+    except ValueError:
+        return False
+    atomic_write_bytes(Path(path), data)
+    return True
+
+
+def load_snapshot(path: Union[str, Path], fingerprint: str) -> Optional[Dict[str, Any]]:
+    """读取配置快照.
+
+    Args:
+        path (Union[str, Path]): 快照文件路径.
+        fingerprint (str): 当前输入的指纹.
+
+    Returns:
+        Optional[Dict[str, Any]]: 快照中的配置,快照不存在,已损坏或指纹不一致时返回None
+
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("fingerprint") != fingerprint:
+        return None
+    config = snapshot.get("config")
+    if not isinstance(config, dict):
+        return None
+    return config
@@ -2,10 +2,14 @@
 
 模块需要的工具.
 """
+import os
+import json
 import warnings
 import argparse
+import tempfile
 import jsonref
-from typing import List, Dict, Any, Optional, cast
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional, Mapping, cast
 from .entrypoint_base import EntryPointABC, PropertyType, ItemType, SchemaType
 
 
@@ -32,6 +36,55 @@ def get_parent_tree(c: EntryPointABC) -> List[str]:
     return list(reversed(result_list))
 
 
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """原子地写入文件.
+
+    先在目标目录中写临时文件再用`os.replace`替换,并发的进程不会读到写了一半的文件.目录不存在时会被创建.
+
+    Args:
+        path (Path): 目标文件路径.
+        data (bytes): 文件内容.
+
+    Raises:
+        OSError: 无法写入
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _fingerprint_default(obj: Any) -> Any:
+    # jsonref替换引用后得到的是代理对象,需要转为真实容器才能序列化
+    if isinstance(obj, (dict, Mapping)):
+        return dict(obj)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def schema_fingerprint(schema: Any, *, sort_keys: bool = True) -> str:
+    """计算schema的稳定指纹.
+
+    指纹为按key排序后的紧凑json字符串,内容相同的schema无论key的顺序如何都会得到相同的指纹.
+
+    Args:
+        schema (Any): json schema字典.
+        sort_keys (bool): 是否按key排序,为False时指纹保留key的顺序,用于字段顺序会影响结果的缓存. Defaults to True.
+
+    Returns:
+        str: schema的指纹
+
+    """
+    return json.dumps(schema, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False, default=_fingerprint_default)
+
+
 def parse_value_string_by_schema(schema: Any, value_str: str) -> Any:
     """根据schema的定义解析字符串的值.
 
@@ -66,6 +119,31 @@ def parse_value_string_by_schema(schema: Any, value_str: str) -> Any:
         return value_str
 
 
+class LazyHelpArgumentParser(argparse.ArgumentParser):
+    """帮助信息按需生成的命令行解析器.
+
+    `epilog_factory`只会在第一次格式化帮助信息时调用,格式化后的帮助信息会被缓存到再次添加参数为止.
+    正常解析参数时不会生成帮助信息.
+    """
+
+    def __init__(self, *args: Any, epilog_factory: Optional[Callable[[], str]] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._epilog_factory = epilog_factory
+        self._help_cache: Optional[str] = None
+
+    def add_argument(self, *args: Any, **kwargs: Any) -> argparse.Action:
+        self._help_cache = None
+        return super().add_argument(*args, **kwargs)
+
+    def format_help(self) -> str:
+        if self._help_cache is None:
+            if self._epilog_factory is not None:
+                self.epilog = self._epilog_factory()
+                self._epilog_factory = None
+            self._help_cache = super().format_help()
+        return self._help_cache
+
+
 def _argparse_base_handdler(_type: Any, key: str, schema: PropertyType, parser: argparse.ArgumentParser, *,
                             required: bool = False, noflag: bool = False) -> argparse.ArgumentParser:
     kwargs: Dict[str, Any] = {}
@@ -0,0 +1,153 @@
+"""validator.
+
+按schema指纹缓存的配置校验器.
+
+`jsonschema.validate`每次调用都会重新校验schema本身并构造新的校验器,
+这里对相同指纹的schema只构造一次校验器,之后的调用以及使用相同schema的其他节点都复用它.
+
+schema在`SUPPORT_SCHEMA`支持的子集内时会使用`compiler`模块生成的专用校验函数,否则使用`jsonschema`的校验器.
+"""
+import json
+import functools
+import threading
+from typing import Any, Optional
+from jsonschema.validators import validator_for
+from jsonschema.exceptions import ValidationError, best_match
+
+from .protocol import SUPPORT_SCHEMA
+from .utils import schema_fingerprint
+from .compiler import CompiledValidator, compile_validator
+
+
+class SchemaValidator:
+    """一个schema对应的校验器.
+
+    Attributes:
+        validator (Any): schema对应的jsonschema校验器
+        compiled (Optional[CompiledValidator]): 编译得到的专用校验函数,schema无法编译时为None
+
+    """
+
+    def __init__(self, schema: Any) -> None:
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        self.validator = cls(schema)
+        self.compiled: Optional[CompiledValidator] = compile_validator(schema)
+
+    def validate(self, instance: Any) -> None:
+        """校验数据,失败时抛出`jsonschema.exceptions.ValidationError`."""
+        if self.compiled is not None:
+            try:
+                self.compiled(instance)
+            except ValidationError:
+                # 编译的校验函数只负责快速判断,失败时由jsonschema给出带字段路径和schema位置的错误
+                pass
+            else:
+                return
+        error = best_match(self.validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+
+# 节点在自身缓存中复用校验器的次数,计入`validator_cache_info()`的命中次数
+_reuse_hits = 0
+_reuse_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_validator(fingerprint: str) -> SchemaValidator:
+    return SchemaValidator(json.loads(fingerprint))
+
+
+def get_validator(schema: Any) -> SchemaValidator:
+    """获取schema对应的校验器.
+
+    jsonschema校验器的类型由schema中的`$schema`字段决定,与`jsonschema.validate`的行为一致.
+
+    Args:
+        schema (Any): json schema字典.
+
+    Raises:
+        jsonschema.exceptions.SchemaError: schema本身不合法
+
+    Returns:
+        SchemaValidator: 构造好的校验器
+
+    """
+    return _build_validator(schema_fingerprint(schema))
+
+
+def cached_validate(instance: Any, schema: Any) -> None:
+    """使用缓存的校验器校验数据.
+
+    与`jsonschema.validate`一样,校验失败时抛出错误.
+
+    Args:
+        instance (Any): 待校验的数据.
+        schema (Any): json schema字典.
+
+    Raises:
+        jsonschema.exceptions.ValidationError: 数据不满足schema
+        jsonschema.exceptions.SchemaError: schema本身不合法
+
+    """
+    get_validator(schema).validate(instance)
+
+
+@functools.lru_cache(maxsize=None)
+def get_support_validator() -> Any:
+    """获取`SUPPORT_SCHEMA`的校验器.
+
+    整个进程只构造一次.
+
+    Returns:
+        Any: `SUPPORT_SCHEMA`对应的jsonschema校验器
+
+    """
+    cls = validator_for(SUPPORT_SCHEMA)
+    cls.check_schema(SUPPORT_SCHEMA)
+    return cls(SUPPORT_SCHEMA)
+
+
+def check_support_schema(schema: Any) -> None:
+    """校验节点的schema是否在模块支持的范围内.
+
+    Args:
+        schema (Any): 节点的json schema字典.
+
+    Raises:
+        jsonschema.exceptions.ValidationError: schema不满足`SUPPORT_SCHEMA`
+
+    """
+    error = best_match(get_support_validator().iter_errors(schema))
+    if error is not None:
+        raise error
+
+
+def record_validator_hit() -> None:
+    """记录一次调用方在自己的缓存中复用了`get_validator`得到的校验器."""
+    global _reuse_hits
+    with _reuse_lock:
+        _reuse_hits += 1
+
+
+def validator_cache_info() -> "functools._CacheInfo":
+    """校验器缓存的统计信息.
+
+    命中次数包括按schema指纹命中的次数和节点通过`record_validator_hit`记录的复用次数.
+
+    Returns:
+        functools._CacheInfo: 命中次数,未命中次数,最大容量和当前缓存的校验器数量
+
+    """
+    info = _build_validator.cache_info()
+    with _reuse_lock:
+        return info._replace(hits=info.hits + _reuse_hits)
+
+
+def clear_validator_cache() -> None:
+    """清空校验器缓存和统计信息."""
+    global _reuse_hits
+    _build_validator.cache_clear()
+    with _reuse_lock:
+        _reuse_hits = 0
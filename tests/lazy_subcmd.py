@@ -0,0 +1,18 @@
+"""延迟注册子命令测试用的节点模块."""
+from schema_entry.entrypoint import EntryPoint
+
+
+class Lazy_Leaf(EntryPoint):
+    """延迟加载的叶子节点.
+
+    第二行描述.
+    """
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {
+            "a": {
+                "type": "integer"
+            }
+        }
+    }
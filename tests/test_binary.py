@@ -0,0 +1,117 @@
+import array
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+
+from schema_entry.binary import load_binary_array, check_binary_array, without_binary_properties
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.binary test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.binary test]")
+
+
+class BinaryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Binary test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Binary test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        self.schema: Dict[str, Any] = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string"
+                },
+                "weights": {
+                    "type": "array",
+                    "items": {
+                        "type": "number"
+                    }
+                },
+                "shards": {
+                    "type": "array",
+                    "items": {
+                        "type": "integer"
+                    }
+                }
+            }
+        }
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_load_binary_array(self) -> None:
+        p = self.dir / "weights.f64"
+        p.write_bytes(array.array("d", [0.5, 1.5, 2.5]).tobytes())
+        view = load_binary_array(p, "f64")
+        assert view.format == "d"
+        assert view.readonly
+        assert view.tolist() == [0.5, 1.5, 2.5]
+        p = self.dir / "empty.i32"
+        p.write_bytes(b"")
+        assert len(load_binary_array(p, "i32")) == 0
+        p = self.dir / "broken.i32"
+        p.write_bytes(b"\x00" * 5)
+        with self.assertRaises(ValueError):
+            load_binary_array(p, "i32")
+        with self.assertRaises(ValueError):
+            load_binary_array(p, "c128")
+
+    def test_check_binary_array(self) -> None:
+        ints = memoryview(array.array("q", [1, 2, 3]).tobytes()).cast("q")
+        floats = memoryview(array.array("d", [1.0]).tobytes()).cast("d")
+        assert check_binary_array("a", ints, {"type": "array", "items": {"type": "integer"}}) is None
+        assert check_binary_array("a", ints, {"type": "array", "items": {"type": "number"}}) is None
+        assert check_binary_array("a", floats, {"type": "array", "items": {"type": "integer"}}) is not None
+        assert check_binary_array("a", ints, {"type": "array", "items": {"type": "string"}}) is not None
+        schema = without_binary_properties(self.schema, ["weights"])
+        assert schema["properties"]["weights"] == {}
+        assert self.schema["properties"]["weights"]["type"] == "array"
+
+    def test_entrypoint_binary_field(self) -> None:
+        (self.dir / "weights.f64").write_bytes(array.array("d", [0.5, 1.5]).tobytes())
+        (self.dir / "shards.bin").write_bytes(array.array("i", [3, 4, 5]).tobytes())
+        config_file = self.dir / "config.json"
+        config_file.write_text('{"name": "a", "weights": {"$binary": "weights.f64"}, "shards": {"$binary": "shards.bin", "dtype": "i32"}}')
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(config_file)]
+            schema = self.schema
+
+        root = A()
+
+        @root.as_main
+        def _(name: str, weights: memoryview, shards: memoryview) -> Dict[str, Any]:
+            return {"name": name, "weights": weights.tolist(), "shards": shards.tolist()}
+
+        assert root([]) == {"caller": "a", "result": {"name": "a", "weights": [0.5, 1.5], "shards": [3, 4, 5]}}
+        assert isinstance(root.config["weights"], memoryview)
+
+    def test_entrypoint_binary_field_invalid(self) -> None:
+        (self.dir / "shards.f64").write_bytes(array.array("d", [0.5]).tobytes())
+        config_file = self.dir / "config.json"
+        config_file.write_text('{"shards": {"$binary": "shards.f64"}}')
+        missing_file = self.dir / "missing.json"
+        missing_file.write_text('{"shards": {"$binary": "missing.i64"}}')
+        for p in (config_file, missing_file):
+            class A(EntryPoint):
+                default_config_file_paths = [str(p)]
+                schema = self.schema
+
+            root = A()
+            with self.subTest(p=p.name):
+                with self.assertRaises(SystemExit):
+                    root([])
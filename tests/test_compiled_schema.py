@@ -0,0 +1,79 @@
+import unittest
+
+from schema_entry.compiled_schema import compile_schema
+from schema_entry.frozen import FrozenList
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.compiled_schema test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.compiled_schema test]")
+
+
+class CompiledSchemaTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp CompiledSchema test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown CompiledSchema test context")
+
+    def test_index(self) -> None:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a_a": {
+                    "type": "number",
+                    "title": "a",
+                    "default": 1.5
+                },
+                "b": {
+                    "type": "boolean"
+                },
+                "c": {
+                    "type": "array",
+                    "items": {
+                        "type": "integer"
+                    },
+                    "default": [1, 2]
+                },
+                "d": {
+                    "type": "string",
+                    "default": ""
+                }
+            },
+            "required": ["a_a", "b"]
+        }
+        compiled = compile_schema(schema)
+        assert compiled is compile_schema(dict(schema))
+        assert compiled.keys == ("a_a", "b", "c", "d")
+        assert compiled.required == frozenset(["a_a", "b"])
+        assert compiled.boolean_keys == frozenset(["b"])
+        assert compiled.option_strings["a_a"] == ("-a", "--a-a")
+        self.assertDictEqual(compiled.defaults, {"a_a": 1.5, "c": [1, 2]})
+        assert isinstance(compiled.defaults["c"], FrozenList)
+        assert compiled.converters["c"].from_string("3,4") == [3, 4]
+        reordered = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "zeta": {
+                    "type": "integer",
+                    "default": 1
+                },
+                "alpha": {
+                    "type": "integer",
+                    "default": 2
+                }
+            }
+        }
+        compiled = compile_schema(reordered)
+        assert compiled.keys == ("zeta", "alpha")
+        assert list(compiled.defaults) == ["zeta", "alpha"]
+        assert list(compiled.converters) == ["zeta", "alpha"]
+        reversed_schema = dict(reordered, properties=dict(reversed(list(reordered["properties"].items()))))
+        assert compile_schema(reversed_schema).keys == ("alpha", "zeta")
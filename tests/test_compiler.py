@@ -0,0 +1,115 @@
+import unittest
+from typing import Any
+import jsonschema
+import jsonschema.exceptions
+
+from schema_entry.compiler import compile_validator, generate_validator_source
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.compiler test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.compiler test]")
+
+
+SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "a": {
+            "type": "integer",
+            "minimum": 1,
+            "exclusiveMaximum": 10
+        },
+        "b": {
+            "type": "number",
+            "enum": [1.5, 2]
+        },
+        "c": {
+            "type": "string",
+            "pattern": "^a{2}\"",
+            "minLength": 3,
+            "maxLength": 5
+        },
+        "d": {
+            "type": "boolean",
+            "const": True
+        },
+        "e": {
+            "type": "array",
+            "items": {
+                "type": "string",
+                "enum": ["x", "y"]
+            }
+        }
+    },
+    "required": ["a"]
+}
+
+
+class CompilerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Compiler test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Compiler test context")
+
+    def assertSameResult(self, instance: Any) -> None:
+        compiled = compile_validator(SCHEMA)
+        assert compiled is not None
+        try:
+            jsonschema.validate(instance, SCHEMA)
+        except jsonschema.exceptions.ValidationError:
+            with self.assertRaises(jsonschema.exceptions.ValidationError):
+                compiled(instance)
+        else:
+            compiled(instance)
+
+    def test_same_result_as_jsonschema(self) -> None:
+        instances = [
+            {"a": 1},
+            {"a": 1.0},
+            {"a": True},
+            {"a": 10},
+            {"a": 0},
+            {},
+            [],
+            {"a": 2, "b": 2.0},
+            {"a": 2, "b": 3},
+            {"a": 2, "b": "1.5"},
+            {"a": 2, "c": "aa\""},
+            {"a": 2, "c": "ab\""},
+            {"a": 2, "c": "aa\"xyz"},
+            {"a": 2, "d": True},
+            {"a": 2, "d": False},
+            {"a": 2, "d": 1},
+            {"a": 2, "e": ["x", "y"]},
+            {"a": 2, "e": ["x", "z"]},
+            {"a": 2, "e": "x"},
+            {"a": 2, "f": "anything"},
+        ]
+        for instance in instances:
+            with self.subTest(instance=instance):
+                self.assertSameResult(instance)
+
+    def test_cached(self) -> None:
+        assert compile_validator(SCHEMA) is compile_validator(dict(SCHEMA))
+        source = generate_validator_source(SCHEMA)
+        assert source is not None
+        assert source.startswith("def validate(instance):")
+
+    def test_unsupported_schema(self) -> None:
+        schemas = [
+            {"type": "object", "properties": {"a": {"type": "object"}}},
+            {"type": "object", "properties": {"a": {"type": ["string", "null"]}}},
+            {"type": "object", "properties": {"a": {"type": "string"}}, "additionalProperties": False},
+            {"type": "object", "properties": {"a": {"type": "array", "items": [{"type": "string"}]}}},
+            {"$schema": "http://json-schema.org/draft-04/schema#", "type": "object", "properties": {"a": {"type": "integer"}}},
+        ]
+        for schema in schemas:
+            with self.subTest(schema=schema):
+                assert compile_validator(schema) is None
@@ -0,0 +1,91 @@
+import bz2
+import gzip
+import json
+import lzma
+import tempfile
+import unittest
+from pathlib import Path
+
+from schema_entry.compression import CompressedCodec, split_compression_suffix, decompression_info, clear_decompression_info
+from schema_entry.config_codecs import get_config_codec
+from schema_entry.extract import SelectiveParser
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.compression test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.compression test]")
+
+
+class CompressionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Compression test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Compression test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        clear_decompression_info()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_split_compression_suffix(self) -> None:
+        assert split_compression_suffix(Path("config.json.gz")) == (".json", ".gz")
+        assert split_compression_suffix(Path("a.b/config.v1.yml.xz")) == (".yml", ".xz")
+        assert split_compression_suffix(Path("config.json")) == (".json", None)
+        assert split_compression_suffix(Path("config.gz")) == (".gz", None)
+
+    def test_compressed_codec(self) -> None:
+        data = {"a": 1, "b": list(range(100))}
+        raw = json.dumps(data).encode("utf-8")
+        for compression, compress in ((".gz", gzip.compress), (".xz", lzma.compress), (".bz2", bz2.compress)):
+            p = self.dir / f"config.json{compression}"
+            p.write_bytes(compress(raw))
+            codec = CompressedCodec(get_config_codec(".json"), compression)  # type: ignore[arg-type]
+            with self.subTest(compression=compression):
+                assert codec == CompressedCodec(get_config_codec(".json"), compression)  # type: ignore[arg-type]
+                assert codec(p) == data
+                info = decompression_info()[str(p.resolve())]
+                assert info.reads == 1
+                assert info.raw_bytes == p.stat().st_size
+                assert info.decompressed_bytes == len(raw)
+
+    def test_selective_parser(self) -> None:
+        p = self.dir / "config.yml.gz"
+        p.write_bytes(gzip.compress(b"a: 1\nb: [1, 2]\nc: x\n"))
+        assert SelectiveParser(["a", "c"], ".gz")(p) == {"a": 1, "c": "x"}
+
+    def test_entrypoint_load_paths(self) -> None:
+        default = self.dir / "default.yml.xz"
+        default.write_bytes(lzma.compress(b"a: 1\nb: x\nc: 0\n"))
+        cmd = self.dir / "cmd.json.gz"
+        cmd.write_bytes(gzip.compress(b'{"b": "y"}'))
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(default)]
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    },
+                    "b": {
+                        "type": "string"
+                    }
+                }
+            }
+        root = A(config_file_only_get_need=True)
+        root([])
+        self.assertDictEqual(root.config, {"a": 1, "b": "x"})
+        root(["-c", str(cmd)])
+        self.assertDictEqual(root.config, {"a": 1, "b": "y"})
+        assert str(cmd.resolve()) in decompression_info()
@@ -0,0 +1,84 @@
+import json
+import marshal
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from schema_entry.config_codecs import ConfigCodec, get_config_codec, register_config_codec, config_codec_suffixes
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.config_codecs test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.config_codecs test]")
+
+
+def _load_lines(f: BinaryIO) -> Any:
+    return dict(line.split("=", 1) for line in f.read().decode("utf-8").splitlines())
+
+
+class ConfigCodecTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp ConfigCodec test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown ConfigCodec test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_builtin_codecs(self) -> None:
+        for suffix in (".json", ".yml", ".yaml", ".toml", ".marshal"):
+            assert suffix in config_codec_suffixes()
+        assert get_config_codec(".yml") is get_config_codec(".yaml")
+        assert get_config_codec(".ini") is None
+        files = {
+            "a.json": json.dumps({"a": 1}).encode("utf-8"),
+            "a.yaml": b"a: 1\n",
+            "a.toml": b"a = 1\n",
+            "a.marshal": marshal.dumps({"a": 1}),
+        }
+        for name, data in files.items():
+            p = self.dir / name
+            p.write_bytes(data)
+            codec = get_config_codec(p.suffix)
+            assert codec is not None
+            with self.subTest(name=name):
+                assert codec(p) == {"a": 1}
+
+    def test_entrypoint_load_paths(self) -> None:
+        register_config_codec(".lines", ConfigCodec("lines", _load_lines))
+        default = self.dir / "default.toml"
+        default.write_text("a = 1\nb = \"x\"\n")
+        cmd = self.dir / "cmd.lines"
+        cmd.write_text("b=y")
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(default)]
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    },
+                    "b": {
+                        "type": "string"
+                    }
+                }
+            }
+        root = A()
+        root([])
+        self.assertDictEqual(root.config, {"a": 1, "b": "x"})
+        root(["-c", str(cmd)])
+        self.assertDictEqual(root.config, {"a": 1, "b": "y"})
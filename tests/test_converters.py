@@ -0,0 +1,77 @@
+import unittest
+
+from schema_entry.converters import build_converter, compile_converters
+from schema_entry.utils import parse_value_string_by_schema
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.converters test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.converters test]")
+
+
+class ConvertersTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Converters test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Converters test context")
+
+    def test_same_as_parse_value_string(self) -> None:
+        cases = [
+            ({}, "a"),
+            ({"type": "string"}, "a"),
+            ({"type": "number"}, "1.5"),
+            ({"type": "integer"}, "12"),
+            ({"type": "boolean"}, "true"),
+            ({"type": "boolean"}, "no"),
+            ({"type": "array"}, "a,b"),
+            ({"type": "array", "items": {"type": "string"}}, "a,b"),
+            ({"type": "array", "items": {"type": "integer"}}, "1,2,3"),
+            ({"type": "array", "items": {"type": "number"}}, "1,2.5"),
+        ]
+        for schema, value in cases:
+            with self.subTest(schema=schema, value=value):
+                assert build_converter(schema)(value) == parse_value_string_by_schema(schema, value)
+
+    def test_compile_converters(self) -> None:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "integer",
+                    "enum": [1, 2]
+                },
+                "b": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["x", "y"]
+                    }
+                },
+                "c": {
+                    "type": "boolean"
+                }
+            }
+        }
+        converters = compile_converters(schema)
+        assert converters is compile_converters(dict(schema))
+        assert converters["a"].from_string("3") == 3
+        assert converters["b"].from_string("x,z") == ["x", "z"]
+        assert converters["c"].from_string("True") is True
+        from_argv = converters["a"].from_argv
+        assert from_argv is not None
+        assert from_argv("2") == 2
+        with self.assertRaises(ValueError):
+            from_argv("3")
+        from_argv = converters["b"].from_argv
+        assert from_argv is not None
+        assert from_argv("x") == "x"
+        with self.assertRaises(ValueError):
+            from_argv("z")
+        assert converters["c"].from_argv is None
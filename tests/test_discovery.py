@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from schema_entry.discovery import find_config_files, invalidate_config_file_lookup
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.discovery test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.discovery test]")
+
+
+class DiscoveryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Discovery test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Discovery test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        invalidate_config_file_lookup()
+        self.tmpdir.cleanup()
+
+    def test_find(self) -> None:
+        a = self.dir / "a.json"
+        a.write_text("{}")
+        candidates = [str(self.dir / "notexist.json"), str(a), str(self.dir / "sub" / "b.json"), str(a)]
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            assert find_config_files(candidates) == [a, a]
+            assert find_config_files(candidates) == [a, a]
+        assert scandir.call_count == 2
+
+    def test_invalidate(self) -> None:
+        b = self.dir / "b.json"
+        assert find_config_files([str(b)]) == []
+        b.write_text("{}")
+        assert find_config_files([str(b)]) == []
+        invalidate_config_file_lookup(str(self.dir))
+        assert find_config_files([str(b)]) == [b]
+        b.unlink()
+        assert find_config_files([str(b)]) == []
+
+    def test_uncached(self) -> None:
+        c = self.dir / "c.json"
+        assert find_config_files([str(c)]) == []
+        c.write_text('{"a": 1}')
+        assert find_config_files([str(c)], cached=False) == [c]
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(c)]
+            config_file_only_get_need = False
+
+        d = self.dir / "d.json"
+        assert find_config_files([str(d)]) == []
+        d.write_text('{"a": 2}')
+        assert A(cache_config_file_lookup=False).parse_configfile_args() == {"a": 1}
+        A.default_config_file_paths = [str(d)]
+        assert A(cache_config_file_lookup=False).parse_configfile_args() == {"a": 2}
@@ -0,0 +1,152 @@
+import os
+import json
+import datetime
+import tempfile
+import types
+import unittest
+from unittest import mock
+from pathlib import Path
+from typing import Any, Dict
+
+from schema_entry.diskcache import DiskCache, persistent_cache, parser_name, CACHE_DIR_ENV, NO_DISK_CACHE_ENV
+from schema_entry.compression import CompressedCodec
+from schema_entry.config_codecs import JSON_CODEC, YAML_CODEC
+from schema_entry.extract import SelectiveParser
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.diskcache test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.diskcache test]")
+
+
+CALLS = []
+
+
+def _parse_json(p: Path) -> Dict[str, Any]:
+    CALLS.append(p)
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _parse_with_date(p: Path) -> Dict[str, Any]:
+    return {"a": datetime.date(2020, 1, 1)}
+
+
+class DiskCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp DiskCache test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown DiskCache test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        self.cache_dir = self.dir / "cache"
+        CALLS.clear()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_load_across_instances(self) -> None:
+        p = self.dir / "a.json"
+        p.write_text(json.dumps({"a": [1, 2]}))
+        cache = DiskCache(self.cache_dir)
+        assert cache.load(p, _parse_json) == {"a": [1, 2]}
+        assert cache.info().writes == 1
+        other = DiskCache(self.cache_dir)
+        assert other.load(p, _parse_json) == {"a": [1, 2]}
+        assert other.info().hits == 1
+        assert len(CALLS) == 1
+        p.write_text(json.dumps({"a": [1, 2, 3]}))
+        assert other.load(p, _parse_json) == {"a": [1, 2, 3]}
+        assert len(CALLS) == 2
+
+    def test_cache_path_versions(self) -> None:
+        p = self.dir / "a.json"
+        p.write_text(json.dumps({"a": 1}))
+        cache = DiskCache(self.cache_dir)
+        cache_path = cache.cache_path(p, _parse_json)
+        with mock.patch("schema_entry.diskcache.__version__", "0.0.0"):
+            assert cache.cache_path(p, _parse_json) != cache_path
+        with mock.patch("yaml.__version__", "0.0.0"):
+            assert cache.cache_path(p, _parse_json) != cache_path
+        assert cache.cache_path(p, _parse_json) == cache_path
+
+    def test_not_cached(self) -> None:
+        p = self.dir / "a.json"
+        p.write_text(json.dumps({"a": 1}))
+        cache = DiskCache(self.cache_dir)
+        cache.load(p, _parse_with_date)
+        cache.load(p, lambda p: {"a": 1})
+        assert cache.info().writes == 0
+        os.environ[NO_DISK_CACHE_ENV] = "1"
+        try:
+            cache.load(p, _parse_json)
+        finally:
+            del os.environ[NO_DISK_CACHE_ENV]
+        assert cache.info() == (0, 1, 0, 0)
+
+    def test_parser_name(self) -> None:
+        name = parser_name(_parse_json)
+        assert name is not None and name.startswith(f"{__name__}:_parse_json#")
+        assert parser_name(_parse_json) == name
+        # 同名但代码不同的解析函数不共享缓存
+        assert parser_name(_parse_with_date) != name
+        edited = types.FunctionType(_parse_with_date.__code__, globals(), "_parse_json")
+        edited.__qualname__ = "_parse_json"
+        assert parser_name(edited) not in (None, name)
+        assert parser_name(lambda p: {}) is None
+        assert parser_name(YAML_CODEC) == "schema_entry.config_codecs:ConfigCodec.yaml"
+        assert parser_name(JSON_CODEC) is None
+        assert parser_name(CompressedCodec(JSON_CODEC, ".gz")) == "schema_entry.compression:CompressedCodec.json.gz"
+        assert parser_name(SelectiveParser(["b", "a"])) == "schema_entry.extract:SelectiveParser.yaml[a,b]"
+        assert "__qualname__" not in vars(YAML_CODEC)
+
+    def test_evict(self) -> None:
+        cache = DiskCache(self.cache_dir)
+        for i in range(3):
+            p = self.dir / f"{i}.json"
+            p.write_text(json.dumps({"a": i}))
+            cache.load(p, _parse_json)
+        files = list(self.cache_dir.iterdir())
+        assert len(files) == 3
+        cache.maxbytes = files[0].stat().st_size * 2
+        assert cache.evict() == 1
+        assert len(list(self.cache_dir.iterdir())) == 2
+        cache.clear()
+        assert list(self.cache_dir.iterdir()) == []
+
+    def test_entrypoint(self) -> None:
+        p = self.dir / "config.yml"
+        p.write_text("a: 1\nb: 2\n")
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(p)]
+            cache_config_file = False
+            persistent_config_cache = True
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+        os.environ[CACHE_DIR_ENV] = str(self.cache_dir)
+        try:
+            persistent_cache.clear()
+            A()([])
+            root = A()
+            root([])
+        finally:
+            del os.environ[CACHE_DIR_ENV]
+        self.assertDictEqual(root.config, {"a": 1})
+        assert persistent_cache.info().hits == 1
@@ -1,11 +1,16 @@
 import os
 import json
+import io
+import argparse
+import contextlib
+import tempfile
 import unittest
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence, Tuple
 import jsonschema.exceptions
 
 from schema_entry.entrypoint import EntryPoint
+from schema_entry.entrypoint_base import CallerReturnType, EntryPointABC
 
 
 def setUpModule() -> None:
@@ -603,3 +608,333 @@ class LoadConfigTest(unittest.TestCase):
         self.assertDictEqual(root.config, {
             "a_a": ["a", "b", "c"]
         })
+
+
+class LazyCheckSchemaTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp LazyCheckSchemaTest test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown LazyCheckSchemaTest test context")
+
+    def make_tree(self) -> EntryPoint:
+        class A(EntryPoint):
+            lazy_check_schema = True
+
+        class B(EntryPoint):
+            lazy_check_schema = True
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+
+        class C(EntryPoint):
+            lazy_check_schema = True
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "object"
+                    }
+                }
+            }
+        root = A()
+        root.regist_sub(B)
+        root.regist_sub(C)
+        return root
+
+    def test_only_dispatched_node_checked(self) -> None:
+        root = self.make_tree()
+        result = root(["b", "--a", "1"])
+        assert result == {"caller": "b", "result": {"a": 1}}
+        with self.assertRaises(jsonschema.exceptions.ValidationError):
+            root(["c"])
+
+    def test_check_tree(self) -> None:
+        root = self.make_tree()
+        with self.assertRaises(jsonschema.exceptions.ValidationError):
+            root.check_tree()
+
+    def test_lazy_flag_in_init(self) -> None:
+        node = EntryPoint(name="test_a", lazy_check_schema=True, schema={
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "object"
+                }
+            }
+        })
+        with self.assertRaises(jsonschema.exceptions.ValidationError):
+            node.check_tree()
+
+
+class ParserCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp ParserCacheTest test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown ParserCacheTest test context")
+
+    def test_reuse_parser(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+        root = Test_A()
+        assert root(["--a", "1"]) == {"caller": "test_a", "result": {"a": 1}}
+        parser = root._get_parser()
+        assert root(["--a", "2"]) == {"caller": "test_a", "result": {"a": 2}}
+        assert root._get_parser() is parser
+
+    def test_invalidate_parser(self) -> None:
+        class Test_A(EntryPoint):
+            pass
+        root = Test_A()
+        root.with_schema({
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "integer"
+                }
+            }
+        })
+        parser = root._get_parser()
+        root.argparse_noflag = "a"
+        assert root._get_parser() is not parser
+        assert root(["3"]) == {"caller": "test_a", "result": {"a": 3}}
+        root.with_schema({
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "b": {
+                    "type": "integer"
+                }
+            }
+        })
+        root.argparse_noflag = None
+        assert root(["--b", "4"]) == {"caller": "test_a", "result": {"b": 4}}
+
+    def test_invalidate_subcmd_parser(self) -> None:
+        class A(EntryPoint):
+            pass
+
+        class B(EntryPoint):
+            pass
+
+        class C(EntryPoint):
+            pass
+        root = A()
+        root.regist_sub(B)
+        assert root(["b"]) == {"caller": "b", "result": {}}
+        parser = root._get_parser()
+        assert root(["b"]) == {"caller": "b", "result": {}}
+        assert root._get_parser() is parser
+        root.regist_sub(C)
+        assert root._get_parser() is not parser
+        assert root(["c"]) == {"caller": "c", "result": {}}
+
+    def test_override_parse_args(self) -> None:
+        class Test_A(EntryPoint):
+            def parse_args(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Optional[Any]:
+                parser.add_argument("--extra", action="store_true")
+                return super().parse_args(parser, argv)
+        root = Test_A()
+        assert root(["--extra"]) == {"caller": "test_a", "result": {"extra": True}}
+        assert root([]) == {"caller": "test_a", "result": {"extra": False}}
+        assert root._get_parser() is not root._get_parser()
+
+    def test_override_parse_commandline_args(self) -> None:
+        class Test_A(EntryPoint):
+            def parse_commandline_args(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+                parser.add_argument("--x", type=int)
+                args = parser.parse_args(argv)
+                return {}, {"x": args.x}
+        root = Test_A()
+        assert root(["--x", "1"]) == {"caller": "test_a", "result": {"x": 1}}
+        assert root(["--x", "2"]) == {"caller": "test_a", "result": {"x": 2}}
+
+
+class DispatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp DispatchTest test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown DispatchTest test context")
+
+    def make_tree(self) -> Tuple[EntryPoint, EntryPoint, EntryPoint]:
+        class A(EntryPoint):
+            pass
+
+        class B(EntryPoint):
+            pass
+
+        class C(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "x": {
+                        "type": "integer"
+                    }
+                }
+            }
+        root = A()
+        b = root.regist_sub(B)
+        c = b.regist_sub(C)
+        assert isinstance(b, EntryPoint)
+        assert isinstance(c, EntryPoint)
+        return root, b, c
+
+    def test_resolve_subcmd(self) -> None:
+        root, b, c = self.make_tree()
+        assert root._resolve_subcmd(["b", "c", "--x", "1"]) == (c, 2)
+        assert root._resolve_subcmd(["b"]) == (b, 1)
+        assert root._resolve_subcmd(["b", "d"]) == (b, 1)
+        assert root._resolve_subcmd(["-h"]) == (root, 0)
+
+    def test_no_intermediate_parser(self) -> None:
+        root, b, c = self.make_tree()
+        assert root(["b", "c", "--x", "1"]) == {"caller": "c", "result": {"x": 1}}
+        assert root._parser_cache is None
+        assert b._parser_cache is None
+        assert c._parser_cache is not None
+
+    def test_unknown_subcmd(self) -> None:
+        root, b, _ = self.make_tree()
+        with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                root(["b", "d"])
+        assert "未知的子命令 `d`" in out.getvalue()
+        assert b._parser_cache is not None
+
+    def test_override_pass_args_to_sub(self) -> None:
+        class A(EntryPoint):
+            pass
+
+        class B(EntryPoint):
+            def pass_args_to_sub(self, parser: argparse.ArgumentParser, argv: Sequence[str]) -> Optional[CallerReturnType]:
+                return {"caller": "b", "result": list(argv)}
+
+        class C(EntryPoint):
+            pass
+        root = A()
+        root.regist_sub(B).regist_sub(C)
+        assert root(["b", "c"]) == {"caller": "b", "result": ["c"]}
+
+
+class LazyHelpTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp LazyHelpTest test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown LazyHelpTest test context")
+
+    def test_epilog_on_demand(self) -> None:
+        class A(EntryPoint):
+            pass
+
+        class B(EntryPoint):
+            """子命令b.
+
+            第二行不展示.
+            """
+
+        class C(EntryPoint):
+            pass
+        root = A()
+        root.regist_sub(B)
+        assert root(["b"]) == {"caller": "b", "result": {}}
+        assert root._subcmd_epilog is None
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit):
+                root(["-h"])
+        assert "b\t子命令b." in out.getvalue()
+        assert "第二行不展示" not in out.getvalue()
+        assert root._subcmd_epilog is not None
+        root.regist_sub(C)
+        assert root._subcmd_epilog is None
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit):
+                root(["-h"])
+        assert "\nc" in out.getvalue()
+
+    def test_custom_epilog(self) -> None:
+        class A(EntryPoint):
+            epilog = "自定义epilog"
+
+        class B(EntryPoint):
+            pass
+        root = A()
+        root.regist_sub(B)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit):
+                root(["-h"])
+        assert "自定义epilog" in out.getvalue()
+        assert root._subcmd_epilog is None
+
+
+class ConcurrentConfigFileTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp ConcurrentConfigFile test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown ConcurrentConfigFile test context")
+
+    def test_concurrent_load_all(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = []
+            for i in range(6):
+                p = Path(tmpdir) / f"{i}.json"
+                p.write_text(json.dumps({"a": i, f"b{i}": i}))
+                paths.append(str(p))
+            paths.insert(2, str(Path(tmpdir) / "notexist.json"))
+
+            class A(EntryPoint):
+                default_config_file_paths = paths
+                load_all_config_file = True
+                concurrent_config_file = True
+                config_file_only_get_need = False
+                verify_schema = False
+
+            root = A()
+            root([])
+            expected: Dict[str, Any] = {"a": 5}
+            expected.update({f"b{i}": i for i in range(6)})
+            self.assertDictEqual(root.config, expected)
+            timings = root.config_file_timings
+            assert list(timings) == [p for p in paths if "notexist" not in p]
+            assert all(cost >= 0 for cost in timings.values())
+
+    def test_abc_abstract_methods(self) -> None:
+        # 后加入`EntryPointABC`的成员都有默认实现,已有的其他实现不需要修改
+        assert EntryPointABC.__abstractmethods__ == frozenset({
+            "__call__", "as_main", "config", "do_main", "name", "parse_args", "parse_commandline_args",
+            "parse_configfile_args", "parse_env_args", "pass_args_to_sub", "prog", "regist_config_file_parser",
+            "regist_sub", "regist_subcmd", "validat_config", "with_schema"
+        })
+        assert EntryPointABC.poll_config_files(EntryPoint()) is False
+        assert EntryPointABC.read_config_file(EntryPoint(), Path("a"), lambda p: {"p": str(p)}) == {"p": "a"}
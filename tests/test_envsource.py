@@ -0,0 +1,112 @@
+import os
+import unittest
+from unittest import mock
+from typing import Any
+
+from schema_entry.envsource import EnvSource
+from schema_entry.entrypoint import EntryPoint
+from schema_entry.entrypoint_base import PropertyType
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.envsource test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.envsource test]")
+
+
+class EnvSourceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp EnvSource test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown EnvSource test context")
+
+    def test_with_prefix(self) -> None:
+        source = EnvSource({"APP_A": "1", "APP_B": "", "APPX_C": "2", "OTHER": "3"})
+        assert source.with_prefix("APP") == {"APP_A": "1"}
+        assert source.with_prefix("APP") is source.with_prefix("APP")
+        assert source.get("OTHER") == "3"
+        assert source.get("NOTEXIST") is None
+
+    def test_snapshot(self) -> None:
+        os.environ["ENVSOURCE_TEST_A"] = "1"
+        try:
+            source = EnvSource()
+            assert source.with_prefix("ENVSOURCE_TEST") == {"ENVSOURCE_TEST_A": "1"}
+            os.environ["ENVSOURCE_TEST_B"] = "2"
+            assert source.with_prefix("ENVSOURCE_TEST") == {"ENVSOURCE_TEST_A": "1"}
+        finally:
+            os.environ.pop("ENVSOURCE_TEST_A", None)
+            os.environ.pop("ENVSOURCE_TEST_B", None)
+
+
+class InjectedEnvTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp InjectedEnv test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown InjectedEnv test context")
+
+    def test_injected_env(self) -> None:
+        class A(EntryPoint):
+            pass
+
+        class B(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a_a": {
+                        "type": "integer"
+                    },
+                    "b": {
+                        "type": "array",
+                        "items": {
+                            "type": "string"
+                        }
+                    }
+                }
+            }
+        root = A()
+        b = root.regist_sub(B)
+        result = root(["b"], env={"A_B_A_A": "2", "A_B_B": "x,y", "A_B_C": "3"})
+        assert result is not None
+        self.assertDictEqual(result["result"], {"a_a": 2, "b": ["x", "y"]})
+        assert "A_B_A_A" not in os.environ
+        os.environ["A_B_A_A"] = "3"
+        try:
+            root(["b"])
+        finally:
+            del os.environ["A_B_A_A"]
+        self.assertDictEqual(b.config, {"a_a": 3})
+
+    def test_override_single_key(self) -> None:
+        class A(EntryPoint):
+            def _parse_env_args(self, key: str, info: PropertyType) -> Any:
+                value = super()._parse_env_args(key, info)
+                return None if value is None else value * 10
+
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a_a": {
+                        "type": "integer"
+                    }
+                }
+            }
+        root = A()
+        os.environ["A_A_A"] = "4"
+        try:
+            with mock.patch("schema_entry.entrypoint.EnvSource") as source:
+                assert root.parse_env_args() == {"a_a": 40}
+                assert root([], env={"A_A_A": "5"}) == {"caller": "a", "result": {"a_a": 50}}
+            source.assert_not_called()
+        finally:
+            del os.environ["A_A_A"]
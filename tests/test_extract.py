@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from schema_entry.extract import extract_yaml_keys, SelectiveParser
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.extract test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.extract test]")
+
+
+DOC = {
+    "a": 1,
+    "b": {"x": [1, 2, {"y": "}]\"{["}]},
+    "c": "str\"}",
+    "d": [True, None, 1.5e3],
+    "e": {},
+    "f": []
+}
+
+
+class ExtractTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Extract test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Extract test context")
+
+    def test_extract_yaml(self) -> None:
+        for keys in [{"a"}, {"b", "d"}, {"c", "e", "f"}, set(), {"g"}]:
+            with self.subTest(keys=keys):
+                result = extract_yaml_keys(yaml.dump(DOC), frozenset(keys))
+                assert result == {k: v for k, v in DOC.items() if k in keys}
+        text = "base: &b {x: 1}\nc:\n  <<: *b\n  y: 2\n"
+        assert extract_yaml_keys(text, frozenset(["c"])) is None
+        assert extract_yaml_keys(text, frozenset(["c", "base"])) == {"base": {"x": 1}, "c": {"x": 1, "y": 2}}
+        assert extract_yaml_keys("<<: {x: 1}\nc: 1\n", frozenset(["c"])) is None
+        assert extract_yaml_keys("a: 1\n---\nb: 2\n", frozenset(["a"])) is None
+        assert extract_yaml_keys("1: 1\n'1': 2\n", frozenset(["1"])) == {"1": 2}
+
+    def test_selective_parser(self) -> None:
+        assert SelectiveParser(["a", "b"]) == SelectiveParser(["b", "a"])
+        assert hash(SelectiveParser(["a"])) == hash(SelectiveParser(["a"]))
+        assert SelectiveParser(["a"]) != SelectiveParser(["a"], ".gz")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = Path(tmpdir) / "config.yml"
+            p.write_text("a: 1\nb: [1, 2]\nc: {d: 1}\n")
+
+            class A(EntryPoint):
+                default_config_file_paths = [str(p)]
+                cache_config_file = False
+                schema = {
+                    "$schema": "http://json-schema.org/draft-07/schema#",
+                    "type": "object",
+                    "properties": {
+                        "a": {
+                            "type": "integer"
+                        },
+                        "b": {
+                            "type": "array",
+                            "items": {
+                                "type": "integer"
+                            }
+                        }
+                    }
+                }
+            root = A()
+            parser = root._get_default_config_file_parser(p)
+            assert parser == SelectiveParser(["a", "b"])
+            root([])
+            self.assertDictEqual(root.config, {"a": 1, "b": [1, 2]})
+            root.config_file_only_get_need = False
+            assert root._get_default_config_file_parser(p) == root.parse_yaml_configfile_args
+            root.config_file_only_get_need = True
+            assert root._get_default_config_file_parser(p.with_suffix(".json")) == root.parse_json_configfile_args
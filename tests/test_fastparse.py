@@ -0,0 +1,141 @@
+import io
+import unittest
+import contextlib
+from typing import Any, Dict, List, Optional
+
+from schema_entry.fastparse import build_argv_table
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.fastparse test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.fastparse test]")
+
+
+SCHEMA: Any = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "a_a": {
+            "type": "integer",
+            "title": "a"
+        },
+        "b": {
+            "type": "number"
+        },
+        "s": {
+            "type": "string",
+            "enum": ["x", "y"]
+        },
+        "flag": {
+            "type": "boolean",
+            "title": "f"
+        },
+        "l": {
+            "type": "array",
+            "title": "l",
+            "default": [0],
+            "items": {
+                "type": "integer"
+            }
+        },
+        "pos": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            }
+        }
+    },
+    "required": ["a_a"]
+}
+
+ARGVS = [
+    [],
+    ["p"],
+    ["p", "q"],
+    ["--a-a", "1", "p"],
+    ["p", "--a-a=2"],
+    ["-a", "3", "p"],
+    ["-a4", "p"],
+    ["-a=5", "p"],
+    ["--b", "1.5", "-f", "p"],
+    ["--flag", "p", "q"],
+    ["--flag=1", "p"],
+    ["-l", "1", "--l", "2", "p"],
+    ["--s", "x", "p"],
+    ["--s", "z", "p"],
+    ["--a-a", "x", "p"],
+    ["--a", "1", "p"],
+    ["--a-a", "-1", "p"],
+    ["--unknown", "p"],
+    ["p", "--b", "1", "q"],
+    ["-c", "test_config.json", "p"],
+    ["--", "p"],
+    ["-h"],
+    ["-fa1", "p"],
+    ["--a-a"],
+]
+
+
+def argparse_result(root: EntryPoint, argv: List[str]) -> Optional[Dict[str, Any]]:
+    parser = root._get_parser()
+    with contextlib.redirect_stderr(io.StringIO()), contextlib.redirect_stdout(io.StringIO()):
+        try:
+            return vars(parser.parse_args(argv))
+        except SystemExit:
+            return None
+
+
+class FastParseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp FastParse test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown FastParse test context")
+
+    def test_same_result_as_argparse(self) -> None:
+        for check_required in (False, True):
+            root = EntryPoint(name="test_a", schema=SCHEMA, argparse_noflag="pos", argparse_check_required=check_required)
+            table = build_argv_table(SCHEMA, noflag="pos", check_required=check_required)
+            assert table is not None
+            for argv in ARGVS:
+                with self.subTest(argv=argv, check_required=check_required):
+                    fast = table.parse(argv)
+                    if fast is not None:
+                        assert fast == argparse_result(root, argv)
+
+    def test_fast_path_hit(self) -> None:
+        table = build_argv_table(SCHEMA, noflag="pos")
+        assert table is not None
+        for argv in (["p"], ["-a", "3", "p", "q"], ["-l", "1", "-l2", "--flag", "p"], ["--s=x", "p"]):
+            with self.subTest(argv=argv):
+                assert table.parse(argv) is not None
+        assert table.parse(["-l", "1", "-l2", "p"])["l"] == [0, 1, 2]
+
+    def test_entrypoint_fast(self) -> None:
+        root = EntryPoint(name="test_a", schema=SCHEMA, argparse_noflag="pos", argparse_fast=True)
+        result = root(["-a", "1", "-l", "3", "-f", "p", "q"])
+        assert result == {
+            "caller": "test_a",
+            "result": {
+                "a_a": 1,
+                "flag": True,
+                "l": [0, 3],
+                "pos": ["p", "q"]
+            }
+        }
+        # 使用了参数缩写,退回到argparse解析
+        result = root(["--a", "1", "p"])
+        assert result == {
+            "caller": "test_a",
+            "result": {
+                "a_a": 1,
+                "l": [0],
+                "pos": ["p"]
+            }
+        }
@@ -0,0 +1,117 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+
+from schema_entry.filecache import ConfigFileCache, clear_file_cache, file_cache_info
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.filecache test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.filecache test]")
+
+
+def _parse_json(p: Path) -> Dict[str, Any]:
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ConfigFileCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp ConfigFileCache test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown ConfigFileCache test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_hit_and_invalidate(self) -> None:
+        p = self.dir / "a.json"
+        p.write_text(json.dumps({"a": [1]}))
+        size = p.stat().st_size
+        cache = ConfigFileCache()
+        result = cache.load(p, _parse_json)
+        assert cache.load(p, _parse_json) is result
+        info = cache.info()
+        assert (info.hits, info.misses, info.bytes_saved, info.entries) == (1, 1, size, 1)
+        with self.assertRaises(TypeError):
+            result["a"].append(2)
+        p.write_text(json.dumps({"a": [1, 2]}))
+        assert cache.load(p, _parse_json) == {"a": [1, 2]}
+        assert cache.info().misses == 2
+
+    def test_budget(self) -> None:
+        paths = []
+        for i in range(3):
+            p = self.dir / f"{i}.json"
+            p.write_text(json.dumps({"a": i}))
+            paths.append(p)
+        size = paths[0].stat().st_size
+        cache = ConfigFileCache(maxbytes=size * 2)
+        for p in paths:
+            cache.load(p, _parse_json)
+        info = cache.info()
+        assert info.entries == 2
+        assert info.currbytes == size * 2
+        cache.load(paths[0], _parse_json)
+        assert cache.info().misses == 4
+        cache.maxbytes = 0
+        assert cache.info().entries == 0
+        cache.load(paths[0], _parse_json)
+        assert cache.info().entries == 0
+
+    def test_entrypoint_share_cache(self) -> None:
+        p = self.dir / "config.json"
+        p.write_text(json.dumps({"a": 1, "b": 2}))
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(p)]
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+        clear_file_cache()
+        A()([])
+        root = A()
+        root([])
+        self.assertDictEqual(root.config, {"a": 1})
+        info = file_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+        A(cache_config_file=False)([])
+        assert file_cache_info().misses == 1
+
+    def test_overridden_file_config_filter(self) -> None:
+        p = self.dir / "config.json"
+        p.write_text(json.dumps({"a": 1, "b": 2}))
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(p)]
+            config_file_only_get_need = False
+            verify_schema = False
+
+            def file_config_filter(self, file_param: Dict[str, Any]) -> Dict[str, Any]:
+                file_param.pop("b")
+                return file_param
+        clear_file_cache()
+        for _ in range(2):
+            root = A()
+            root([])
+            self.assertDictEqual(root.config, {"a": 1})
+        assert file_cache_info().hits == 1
@@ -0,0 +1,139 @@
+import json
+import pickle
+import unittest
+from copy import deepcopy
+from typing import List
+
+from schema_entry.frozen import FrozenDict, FrozenList, freeze, thaw
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.frozen test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.frozen test]")
+
+
+class FrozenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Frozen test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Frozen test context")
+
+    def test_freeze(self) -> None:
+        frozen = freeze({"a": [1, 2], "b": {"c": "d"}})
+        assert isinstance(frozen, FrozenDict)
+        assert isinstance(frozen["a"], FrozenList)
+        assert isinstance(frozen["b"], FrozenDict)
+        self.assertDictEqual(frozen, {"a": [1, 2], "b": {"c": "d"}})
+        assert freeze(frozen) is frozen
+        assert freeze({"x": frozen["a"]})["x"] is frozen["a"]
+        assert json.loads(json.dumps(frozen)) == frozen
+
+    def test_readonly(self) -> None:
+        frozen = freeze({"a": [1, 2], "b": {"c": "d"}})
+        with self.assertRaises(TypeError):
+            frozen["a"] = 1
+        with self.assertRaises(TypeError):
+            frozen.update({"a": 1})
+        with self.assertRaises(TypeError):
+            del frozen["b"]
+        with self.assertRaises(TypeError):
+            frozen["a"].append(3)
+        with self.assertRaises(TypeError):
+            frozen["a"] += [3]
+        with self.assertRaises(TypeError):
+            frozen["b"].pop("c")
+
+    def test_copy(self) -> None:
+        frozen = freeze({"a": [1, 2], "b": {"c": "d"}})
+        for copied in (frozen.copy(), deepcopy(frozen), thaw(frozen)):
+            assert type(copied) is dict
+            assert type(copied["a"]) is list
+            copied["a"].append(3)
+            copied["b"]["c"] = "e"
+        self.assertDictEqual(frozen, {"a": [1, 2], "b": {"c": "d"}})
+
+    def test_pickle(self) -> None:
+        frozen = freeze({"a": [1, 2], "b": {"c": "d"}})
+        loaded = pickle.loads(pickle.dumps(frozen))
+        assert isinstance(loaded, FrozenDict)
+        assert loaded == frozen
+
+    def test_entrypoint_config(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "array",
+                        "items": {
+                            "type": "integer"
+                        }
+                    }
+                }
+            }
+        root = Test_A()
+        root(["--a", "1", "--a", "2"])
+        assert root.config is root.config
+        with self.assertRaises(TypeError):
+            root.config["a"].append(3)
+        config = root.config.copy()
+        config["a"].append(3)
+        self.assertDictEqual(root.config, {"a": [1, 2]})
+
+    def test_main_receives_writable_copy(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "array",
+                        "items": {
+                            "type": "integer"
+                        }
+                    }
+                }
+            }
+        root = Test_A()
+
+        @root.as_main
+        def _(a: List[int]) -> List[int]:
+            a.append(3)
+            return a
+
+        assert root(["--a", "1", "--a", "2"]) == {"caller": "test_a", "result": [1, 2, 3]}
+        self.assertDictEqual(root.config, {"a": [1, 2]})
+
+    def test_main_receives_frozen_config(self) -> None:
+        class Test_A(EntryPoint):
+            pass_frozen_config = True
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "array",
+                        "items": {
+                            "type": "integer"
+                        }
+                    }
+                }
+            }
+        root = Test_A()
+
+        @root.as_main
+        def _(a: List[int]) -> bool:
+            assert a is root.config["a"]
+            with self.assertRaises(TypeError):
+                a.append(3)
+            return isinstance(a, FrozenList)
+
+        assert root(["--a", "1", "--a", "2"]) == {"caller": "test_a", "result": True}
@@ -0,0 +1,99 @@
+import os
+import unittest
+
+from schema_entry.layered import LayeredConfig
+from schema_entry.frozen import FrozenDict
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.layered test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.layered test]")
+
+
+class LayeredConfigTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp LayeredConfig test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown LayeredConfig test context")
+
+    def test_lookup(self) -> None:
+        layers = LayeredConfig([
+            ("default", {"a": 1, "b": 1}),
+            ("env", {"b": 2, "c": [1]}),
+        ])
+        layers.set_layer("cmdline", {"c": [2]})
+        assert layers["a"] == 1
+        assert layers["b"] == 2
+        assert layers["c"] == [2]
+        assert "d" not in layers
+        with self.assertRaises(KeyError):
+            layers["d"]
+        assert list(layers) == ["a", "b", "c"]
+        assert len(layers) == 3
+        assert layers.layer_names == ["default", "env", "cmdline"]
+
+    def test_source_of(self) -> None:
+        layers = LayeredConfig([
+            ("default", {"a": 1, "b": 1}),
+            ("env", {"b": 2}),
+        ])
+        assert layers.source_of("a") == "default"
+        assert layers.source_of("b") == "env"
+        assert layers.source_of("c") is None
+        assert layers.sources() == {"a": "default", "b": "env"}
+
+    def test_resolved(self) -> None:
+        layers = LayeredConfig([
+            ("default", {"a": 1, "b": [1]}),
+            ("env", {"b": [2]}),
+        ])
+        resolved = layers.resolved()
+        assert isinstance(resolved, FrozenDict)
+        assert resolved == {"a": 1, "b": [2]}
+        assert resolved is layers.resolved()
+        assert resolved["b"] is layers.layer("env")["b"]
+        layers.set_layer("default", {"a": 3})
+        assert layers.resolved() == {"a": 3, "b": [2]}
+        assert layers.layer_names == ["default", "env"]
+
+    def test_entrypoint_config_source(self) -> None:
+        class Test_A(EntryPoint):
+            env_prefix = "layered_test"
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer",
+                        "default": 1
+                    },
+                    "b": {
+                        "type": "integer",
+                        "default": 1
+                    },
+                    "c": {
+                        "type": "integer",
+                        "default": 1
+                    }
+                }
+            }
+        root = Test_A()
+        assert root.config_source("a") is None
+        os.environ["LAYERED_TEST_B"] = "2"
+        try:
+            root(["--c", "3"])
+        finally:
+            del os.environ["LAYERED_TEST_B"]
+        self.assertDictEqual(root.config, {"a": 1, "b": 2, "c": 3})
+        assert root.config_source("a") == "default"
+        assert root.config_source("b") == "env"
+        assert root.config_source("c") == "cmdline"
+        assert root.config_layers is not None
+        assert root.config_layers.layer("env") == {"b": 2}
@@ -0,0 +1,71 @@
+import io
+import sys
+import unittest
+import contextlib
+
+from schema_entry.entrypoint import EntryPoint
+from schema_entry.lazy import LazySubcmd, import_from_string
+
+MODULE = "tests.lazy_subcmd"
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.lazy test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.lazy test]")
+
+
+class LazySubcmdTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp LazySubcmd test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown LazySubcmd test context")
+
+    def setUp(self) -> None:
+        sys.modules.pop(MODULE, None)
+
+    def make_root(self) -> EntryPoint:
+        class A(EntryPoint):
+            pass
+        root = A()
+        lazy = root.regist_sub(f"{MODULE}:Lazy_Leaf", name="leaf", description="延迟加载的节点")
+        assert isinstance(lazy, LazySubcmd)
+        return root
+
+    def test_import_from_string(self) -> None:
+        assert import_from_string("os.path:join") is __import__("os").path.join
+        with self.assertRaises(ValueError):
+            import_from_string("os.path.join")
+
+    def test_help_without_import(self) -> None:
+        root = self.make_root()
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit):
+                root(["-h"])
+        assert "leaf\t延迟加载的节点" in out.getvalue()
+        assert MODULE not in sys.modules
+
+    def test_dispatch_load(self) -> None:
+        root = self.make_root()
+        result = root(["leaf", "--a", "1"])
+        assert result == {"caller": "leaf", "result": {"a": 1}}
+        assert MODULE in sys.modules
+        leaf = root._subcmds["leaf"]
+        assert not isinstance(leaf, LazySubcmd)
+        assert leaf.parent is root
+        assert leaf.prog == "a leaf"
+
+    def test_check_tree_load(self) -> None:
+        root = self.make_root()
+        root.check_tree()
+        assert MODULE in sys.modules
+
+    def test_name_required(self) -> None:
+        root = EntryPoint(name="root")
+        with self.assertRaises(ValueError):
+            root.regist_sub(f"{MODULE}:Lazy_Leaf")  # type: ignore[call-overload]
@@ -0,0 +1,142 @@
+import os
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+
+from schema_entry.snapshot import snapshot_fingerprint, dump_snapshot, load_snapshot
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.snapshot test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.snapshot test]")
+
+
+class SnapshotTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Snapshot test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Snapshot test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_dump_and_load(self) -> None:
+        p = self.dir / "sub" / "snapshot.bin"
+        fingerprint = snapshot_fingerprint(["a", {"b": 1}])
+        assert fingerprint == snapshot_fingerprint(["a", {"b": 1}])
+        assert fingerprint != snapshot_fingerprint(["a", {"b": 2}])
+        assert dump_snapshot(p, fingerprint, {"a": [1, 2], "b": {"c": "x"}})
+        assert load_snapshot(p, fingerprint) == {"a": [1, 2], "b": {"c": "x"}}
+        assert load_snapshot(p, snapshot_fingerprint([])) is None
+        assert load_snapshot(self.dir / "missing.bin", fingerprint) is None
+        p.write_bytes(b"broken")
+        assert load_snapshot(p, fingerprint) is None
+        assert not dump_snapshot(p, fingerprint, {"a": datetime.date(2020, 1, 1)})
+
+    def test_entrypoint_snapshot(self) -> None:
+        config_file = self.dir / "config.json"
+        config_file.write_text('{"a": 1}')
+        snapshot = self.dir / "snapshot.bin"
+        calls = []
+
+        class A(EntryPoint):
+            config_snapshot = True
+            default_config_file_paths = [str(config_file)]
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    },
+                    "b": {
+                        "type": "string"
+                    }
+                }
+            }
+
+            def parse_configfile_args(self) -> Dict[str, Any]:
+                calls.append("file")
+                return super().parse_configfile_args()
+
+        root = A()
+
+        @root.as_main
+        def _(a: int, b: str) -> Dict[str, Any]:
+            return {"a": a, "b": b}
+
+        argv = ["--b", "x", "--from-snapshot", str(snapshot), f"--dump-resolved-config={snapshot}"]
+        assert root(argv) == {"caller": "a", "result": {"a": 1, "b": "x"}}
+        assert calls == ["file"]
+        assert snapshot.is_file()
+        # 输入没有变化,直接使用快照
+        assert root(argv) == {"caller": "a", "result": {"a": 1, "b": "x"}}
+        assert calls == ["file"]
+        assert root.config_source("a") == "snapshot"
+        # 命令行参数变化
+        assert root(["--b", "y", "--from-snapshot", str(snapshot)]) == {"caller": "a", "result": {"a": 1, "b": "y"}}
+        assert calls == ["file", "file"]
+        # 环境变量变化
+        assert root(argv, env={"A_B": "z"}) == {"caller": "a", "result": {"a": 1, "b": "x"}}
+        assert calls == ["file", "file", "file"]
+        # 配置文件变化
+        config_file.write_text('{"a": 2}')
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert root(argv) == {"caller": "a", "result": {"a": 2, "b": "x"}}
+        assert calls == ["file", "file", "file", "file"]
+        assert root(argv) == {"caller": "a", "result": {"a": 2, "b": "x"}}
+        assert calls == ["file", "file", "file", "file"]
+
+    def test_snapshot_args_disabled(self) -> None:
+        class A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+        root = A()
+        with self.assertRaises(SystemExit):
+            root(["--from-snapshot", str(self.dir / "snapshot.bin")])
+
+    def test_fingerprint_node_options(self) -> None:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "string"
+                }
+            }
+        }
+        argv = ["x"]
+        fingerprints = {
+            EntryPoint(name="t", schema=schema)._snapshot_fingerprint(argv),
+            EntryPoint(name="t", schema=schema, argparse_noflag="a")._snapshot_fingerprint(argv),
+            EntryPoint(name="t", schema=schema, argparse_check_required=True)._snapshot_fingerprint(argv),
+        }
+        assert len(fingerprints) == 3
+        assert EntryPoint(name="t", schema=schema)._snapshot_fingerprint(argv) in fingerprints
+
+    def test_atomic_write(self) -> None:
+        p = self.dir / "sub" / "snapshot.bin"
+        assert dump_snapshot(p, "f", {"a": 1})
+        assert load_snapshot(p, "f") == {"a": 1}
+        assert [q.name for q in p.parent.iterdir()] == ["snapshot.bin"]
@@ -1,5 +1,6 @@
 import unittest
 import argparse
+from unittest import mock
 from schema_entry.utils import get_parent_tree, parse_value_string_by_schema, parse_schema_as_cmd, pydantic_schema_to_protocol
 from schema_entry.entrypoint import EntryPoint
 
@@ -235,3 +236,45 @@ class PydanticSchemaTest(unittest.TestCase):
         target = {'properties': {'gender': {'enum': ['male', 'female', 'other', 'not_given'], 'type': 'string', 'description': 'this is the value of snap', 'title': 'g'}, 'gender_list': {
             'description': 'this is the value of snap', 'items': {'enum': ['male', 'female', 'other', 'not_given'], 'type': 'string'}, 'title': 'l', 'type': 'array'}}, 'required': ['gender', 'gender_list'], 'title': 'D', 'type': 'object'}
         self.assertDictEqual(target, get_schema)
+
+
+class ProgCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp ProgCache test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown ProgCache test context")
+
+    def test_prog_cache(self) -> None:
+        class A(EntryPoint):
+            pass
+
+        class B(EntryPoint):
+            pass
+
+        class C(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a_b": {
+                        "type": "integer"
+                    }
+                }
+            }
+        b = B()
+        c = b.regist_sub(C)
+        assert isinstance(c, EntryPoint)
+        assert c.prog == "b c"
+        env = {"B_C_A_B": "1", "A_B_C_A_B": "2", "APP_A_B": "3"}
+        with mock.patch.dict("os.environ", env):
+            assert c.parse_env_args() == {"a_b": 1}
+            a = A()
+            a.regist_subcmd(b)
+            assert b.prog == "a b"
+            assert c.prog == "a b c"
+            assert c.parse_env_args() == {"a_b": 2}
+            c.env_prefix = "app"
+            assert c.parse_env_args() == {"a_b": 3}
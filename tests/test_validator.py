@@ -0,0 +1,185 @@
+import unittest
+from unittest import mock
+import jsonschema.exceptions
+
+from schema_entry import entrypoint
+from schema_entry.validator import cached_validate, get_validator, validator_cache_info, clear_validator_cache, get_support_validator, check_support_schema
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry.validator test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry.validator test]")
+
+
+class ValidatorCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp ValidatorCache test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown ValidatorCache test context")
+
+    def setUp(self) -> None:
+        clear_validator_cache()
+
+    def test_reuse_validator(self) -> None:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "integer"
+                },
+                "b": {
+                    "type": "string"
+                }
+            }
+        }
+        same_schema = {
+            "properties": {
+                "b": {
+                    "type": "string"
+                },
+                "a": {
+                    "type": "integer"
+                }
+            },
+            "type": "object",
+            "$schema": "http://json-schema.org/draft-07/schema#"
+        }
+        assert get_validator(schema) is get_validator(same_schema)
+        assert isinstance(get_validator(schema).validator, jsonschema.Draft7Validator)
+        info = validator_cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+    def test_cached_validate(self) -> None:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "integer"
+                }
+            },
+            "required": ["a"]
+        }
+        assert cached_validate({"a": 1}, schema) is None
+        with self.assertRaisesRegex(jsonschema.exceptions.ValidationError, "'a' is a required property"):
+            cached_validate({}, schema)
+
+    def test_compiled_error_has_path(self) -> None:
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "type": "object",
+            "properties": {
+                "port": {
+                    "type": "integer"
+                }
+            }
+        }
+        with self.assertRaises(jsonschema.exceptions.ValidationError) as cm:
+            cached_validate({"port": "x"}, schema)
+        assert list(cm.exception.path) == ["port"]
+        assert "On instance['port']" in str(cm.exception)
+
+    def test_node_caches_validator(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+        root = Test_A()
+        with mock.patch.object(entrypoint, "get_validator", wraps=get_validator) as build:
+            for _ in range(3):
+                root(["--a", "1"])
+            root.schema = dict(Test_A.schema)  # type: ignore[arg-type]
+            root(["--a", "1"])
+            assert build.call_count == 2
+
+    def test_invalid_schema(self) -> None:
+        with self.assertRaises(jsonschema.exceptions.SchemaError):
+            cached_validate({}, {"type": 12})
+
+    def test_nodes_share_validator(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer",
+                        "default": 1
+                    }
+                },
+                "required": ["a"]
+            }
+        for _ in range(3):
+            Test_A()(["--a", "2"])
+        info = validator_cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+        root = Test_A()
+        for _ in range(100):
+            root(["--a", "2"])
+        info = validator_cache_info()
+        assert info.misses == 1
+        assert info.hits == 102
+
+
+class SupportSchemaCheckTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp SupportSchemaCheck test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown SupportSchemaCheck test context")
+
+    def test_support_validator_built_once(self) -> None:
+        assert get_support_validator() is get_support_validator()
+
+    def test_check_once_per_class_and_schema(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    }
+                }
+            }
+
+        class Test_B(Test_A):
+            pass
+        with mock.patch.object(entrypoint, "check_support_schema", wraps=check_support_schema) as check:
+            for _ in range(3):
+                Test_A()
+                Test_B()
+            assert check.call_count == 2
+
+    def test_unsupported_schema_always_raise(self) -> None:
+        class Test_A(EntryPoint):
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "object"
+                    }
+                }
+            }
+        for _ in range(2):
+            with self.assertRaises(jsonschema.exceptions.ValidationError):
+                Test_A()
@@ -0,0 +1,121 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+
+from schema_entry.entrypoint import EntryPoint
+
+
+def setUpModule() -> None:
+    print("[SetUp Submodule schema_entry watch test]")
+
+
+def tearDownModule() -> None:
+    print("[TearDown Submodule schema_entry watch test]")
+
+
+def _touch(p: Path, text: str) -> None:
+    """写入文件并确保修改时间变化."""
+    st = p.stat() if p.exists() else None
+    p.write_text(text)
+    if st is not None:
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class WatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        print("setUp Watch test context")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        print("tearDown Watch test context")
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmpdir.name)
+        self.default = self.dir / "default.json"
+        self.default.write_text('{"a": 1, "b": "x"}')
+        self.cmd = self.dir / "cmd.json"
+        self.cmd.write_text('{"b": "y"}')
+        default = self.default
+
+        class A(EntryPoint):
+            default_config_file_paths = [str(default)]
+            schema = {
+                "$schema": "http://json-schema.org/draft-07/schema#",
+                "type": "object",
+                "properties": {
+                    "a": {
+                        "type": "integer"
+                    },
+                    "b": {
+                        "type": "string"
+                    },
+                    "c": {
+                        "type": "string"
+                    }
+                }
+            }
+        self.A = A
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_poll_config_files(self) -> None:
+        root = self.A(watch_config_file=True, watch_interval=3600)
+        reloads: List[Dict[str, Any]] = []
+
+        @root.on_config_reload
+        def _(**config: Any) -> None:
+            config["c"] += "!"
+            reloads.append(config)
+
+        @root.as_main
+        def main(**config: Any) -> None:
+            assert not root.poll_config_files()
+            # 默认配置文件变化,命令行参数层保持不变
+            _touch(self.default, '{"a": 2, "b": "x"}')
+            assert root.poll_config_files()
+            self.assertDictEqual(root.config, {"a": 2, "b": "y", "c": "z"})
+            # 命令行指定的配置文件变化
+            _touch(self.cmd, '{"b": "w"}')
+            assert root.poll_config_files()
+            self.assertDictEqual(root.config, {"a": 2, "b": "w", "c": "z"})
+            assert root.config_source("b") == "cmd_config_file"
+            # 校验失败时保留原来的配置
+            _touch(self.default, '{"a": "not int"}')
+            assert not root.poll_config_files()
+            self.assertDictEqual(root.config, {"a": 2, "b": "w", "c": "z"})
+            # 文件写了一半
+            _touch(self.default, '{"a": 3')
+            assert not root.poll_config_files()
+            self.assertDictEqual(root.config, {"a": 2, "b": "w", "c": "z"})
+
+        root(["-c", str(self.cmd), "--c", "z"])
+        assert [r["a"] for r in reloads] == [2, 2]
+        assert [r["b"] for r in reloads] == ["y", "w"]
+        assert [r["c"] for r in reloads] == ["z!", "z!"]
+
+    def test_watch_thread(self) -> None:
+        root = self.A(watch_config_file=True, watch_interval=0.01)
+        reloaded = threading.Event()
+
+        @root.on_config_reload
+        def _(a: int, b: str) -> None:
+            if a == 2:
+                reloaded.set()
+
+        @root.as_main
+        def main(a: int, b: str) -> bool:
+            assert any(t.name == "schema_entry_watch" for t in threading.enumerate())
+            _touch(self.default, '{"a": 2, "b": "x"}')
+            return reloaded.wait(5)
+
+        assert root([]) == {"caller": "a", "result": True}
+        assert root.config["a"] == 2
+        time.sleep(0.05)
+        assert not any(t.name == "schema_entry_watch" for t in threading.enumerate())